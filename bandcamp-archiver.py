@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import sys
 import datetime
 import json
@@ -6,31 +8,303 @@ import re
 import argparse
 import os
 import hashlib
+import hmac
+import mmap
+import gzip
 import shutil
 import time
 import random
 import html
+import threading
+import queue
+import heapq
+import secrets
+import socket
+import ssl
+import stat
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
 from typing import Union, List, Optional
 from urllib.parse import urljoin, urlparse, urlunparse
-import bs4
-import demjson3
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util import create_urllib3_context
 
+# bs4, demjson3 and requests make up most of the start-up time, so they are imported
+# when the first Bandcamp parser is created. Submitting a job to a running daemon
+# (--connect) or exporting an archive never loads them.
+bs4 = demjson3 = requests = None
+SSLAdapter = None
+
+
+class DNSCache:
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.addresses = {}  # (hostname, family) -> ([addresses], expiry)
+        self.lookups = 0
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    def resolve(self, hostname: str, family: int = socket.AF_UNSPEC) -> List[str]:
+        now = time.monotonic()
+        with self.lock:
+            self.lookups += 1
+            cached = self.addresses.get((hostname, family))
+            if cached and cached[1] > now:
+                self.hits += 1
+                return list(cached[0])
+
+        addresses = list(dict.fromkeys(info[4][0] for info in socket.getaddrinfo(hostname, None, family, socket.SOCK_STREAM)))
+        with self.lock:
+            self.addresses[(hostname, family)] = (addresses, now + self.ttl)
+        return list(addresses)
+
+    def prefer(self, hostname: str, family: int, address: str):
+        # Moves an address that accepted a connection to the front, so later connections
+        # don't wait on an unreachable one first.
+        with self.lock:
+            cached = self.addresses.get((hostname, family))
+            if cached and cached[0][0] != address and address in cached[0]:
+                cached[0].remove(address)
+                cached[0].insert(0, address)
+
+    def forget(self, hostname: str):
+        with self.lock:
+            for key in [key for key in self.addresses if key[0] == hostname]:
+                del self.addresses[key]
+
+DNS_CACHE = DNSCache()
+
+class CachedDNSConnectionMixin:
+    # Connects to the cached addresses of the host in turn, like urllib3 does with a fresh
+    # lookup; TLS still uses the hostname for SNI and certificate checks. The cached
+    # addresses are dropped once none of them accepts a connection.
+    def _new_conn(self):
+        from urllib3.util.connection import allowed_gai_family
+
+        hostname = self._dns_host
+        family = allowed_gai_family()
+        try:
+            addresses = DNS_CACHE.resolve(hostname, family)
+        except OSError:
+            return super()._new_conn()
+
+        last_error = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                connection = super()._new_conn()
+                DNS_CACHE.prefer(hostname, family, address)
+                return connection
+            except Exception as e:
+                last_error = e
+            finally:
+                self._dns_host = hostname
+        DNS_CACHE.forget(hostname)
+        raise last_error
+
+class SessionRecordingSSLSocket(ssl.SSLSocket):
+    # TLS 1.3 session tickets arrive after the handshake, so the session is saved
+    # once data has been read from the connection.
+    def recv_into(self, buffer, nbytes=None, flags=0):
+        received = super().recv_into(buffer, nbytes, flags)
+        if not getattr(self, 'session_recorded', False) and self.server_hostname:
+            session = self.session
+            if session is not None and session.has_ticket:
+                self.context.remember_session(self.server_hostname, session)
+                self.session_recorded = True
+        return received
+
+class ResumingSSLContext(ssl.SSLContext):
+    # Offers the last TLS session seen for a host when opening a new connection to it,
+    # so reconnects to the same artist subdomain or CDN host skip the full handshake.
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.sslsocket_class = SessionRecordingSSLSocket
+        self.stats_lock = threading.Lock()
+        self.tls_sessions = {}
+        self.handshakes = {}  # host -> [full handshakes, resumed handshakes]
+
+    def remember_session(self, hostname: str, session: ssl.SSLSession):
+        with self.stats_lock:
+            self.tls_sessions[hostname] = session
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname:
+            with self.stats_lock:
+                session = self.tls_sessions.get(server_hostname)
+        ssl_socket = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+
+        if server_hostname:
+            with self.stats_lock:
+                counts = self.handshakes.setdefault(server_hostname, [0, 0])
+                counts[1 if ssl_socket.session_reused else 0] += 1
+        return ssl_socket
+
+
+def build_ssl_adapter_class():
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CachedDNSHTTPConnection(CachedDNSConnectionMixin, HTTPConnection):
+        pass
+
+    class CachedDNSHTTPSConnection(CachedDNSConnectionMixin, HTTPSConnection):
+        pass
+
+    class CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CachedDNSHTTPConnection
+
+    class CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CachedDNSHTTPSConnection
+
+    class SSLAdapter(HTTPAdapter):
+        def __init__(self, ssl_context=None, keepalive_idle: int = 60, **kwargs):
+            self.ssl_context = ssl_context
+            self.keepalive_idle = keepalive_idle
+            self.request_counts = {}
+            self.counts_lock = threading.Lock()
+            super().__init__(**kwargs)
+
+        def _socket_options(self) -> list:
+            socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keepalive_idle))
+            if hasattr(socket, 'TCP_KEEPINTVL'):
+                socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10))
+            return socket_options
+
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['ssl_context'] = self.ssl_context
+            kwargs['socket_options'] = self._socket_options()
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {"http": CachedDNSHTTPConnectionPool, "https": CachedDNSHTTPSConnectionPool}
+
+        def send(self, request, *args, **kwargs):
+            host = urlparse(request.url).hostname
+            with self.counts_lock:
+                self.request_counts[host] = self.request_counts.get(host, 0) + 1
+            return super().send(request, *args, **kwargs)
+
+        def proxy_manager_for(self, *args, **kwargs):
+            kwargs['ssl_context'] = self.ssl_context
+            return super().proxy_manager_for(*args, **kwargs)
+
+    return SSLAdapter
+
+def load_network_dependencies():
+    global bs4, demjson3, requests, SSLAdapter
+    if requests is not None:
+        return
+    import bs4
+    import demjson3
+    import requests
+    SSLAdapter = build_ssl_adapter_class()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
 
-class SSLAdapter(HTTPAdapter):
-    def __init__(self, ssl_context=None, **kwargs):
-        self.ssl_context = ssl_context
-        super().__init__(**kwargs)
+class AdaptiveRateController:
+    # Per-host AIMD control of in-flight requests and pacing: healthy responses grow the
+    # limit additively and shrink the gap between requests, while 429s, 5xx responses,
+    # connection errors and latency spikes halve the limit and double the gap.
+    def __init__(self, max_concurrency: int = 4, max_interval: float = 30.0, latency_spike_factor: float = 3.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_interval = max_interval
+        self.latency_spike_factor = latency_spike_factor
+        self.hosts = {}
+        self.condition = threading.Condition()
+        self.logger = logging.getLogger("bandcamp-dl").getChild("Rate")
+
+    def _host_state(self, host: str) -> dict:
+        state = self.hosts.get(host)
+        if state is None:
+            state = {
+                "limit": 1.0, "interval": 0.0, "in_flight": 0, "next_start": 0.0,
+                "latency": None, "last_decrease": 0.0,
+                "requests": 0, "throttled": 0, "errors": 0, "total_latency": 0.0
+            }
+            self.hosts[host] = state
+        return state
+
+    def acquire(self, url: str) -> str:
+        host = urlparse(url).netloc
+        with self.condition:
+            state = self._host_state(host)
+            while state["in_flight"] >= int(state["limit"]):
+                self.condition.wait()
+            state["in_flight"] += 1
+            now = time.monotonic()
+            start_at = max(now, state["next_start"])
+            state["next_start"] = start_at + state["interval"]
+
+        if start_at > now:
+            time.sleep(start_at - now)
+        return host
+
+    def release(self, host: str, latency: float, status_code: Optional[int], retry_after: Optional[float] = None):
+        with self.condition:
+            state = self._host_state(host)
+            state["in_flight"] -= 1
+            if retry_after is not None:
+                state["next_start"] = max(state["next_start"], time.monotonic() + retry_after)
+                self.logger.info(f"{host} asked to retry after {retry_after:.1f}s")
+            state["requests"] += 1
+            state["total_latency"] += latency
+
+            baseline = state["latency"]
+            latency_spike = baseline is not None and latency > self.latency_spike_factor * baseline
+            state["latency"] = latency if baseline is None else 0.8 * baseline + 0.2 * latency
+
+            if status_code == 429:
+                state["throttled"] += 1
+            elif status_code is None or status_code >= 500:
+                state["errors"] += 1
+
+            if status_code is None or status_code == 429 or status_code >= 500 or latency_spike:
+                self._decrease(host, state, status_code, latency_spike)
+            else:
+                state["limit"] = min(self.max_concurrency, state["limit"] + 1.0 / state["limit"])
+                state["interval"] = max(0.0, state["interval"] - 0.05)
 
-    def init_poolmanager(self, *args, **kwargs):
-        kwargs['ssl_context'] = self.ssl_context
-        return super().init_poolmanager(*args, **kwargs)
+            self.condition.notify_all()
 
-    def proxy_manager_for(self, *args, **kwargs):
-        kwargs['ssl_context'] = self.ssl_context
-        return super().proxy_manager_for(*args, **kwargs)
+    def _decrease(self, host: str, state: dict, status_code: Optional[int], latency_spike: bool):
+        # Requests already in flight when we backed off report the same congestion;
+        # only react once per smoothed round trip.
+        now = time.monotonic()
+        if now - state["last_decrease"] < (state["latency"] or 0.0):
+            return
+        state["last_decrease"] = now
+        state["limit"] = max(1.0, state["limit"] / 2)
+        state["interval"] = min(self.max_interval, max(0.25, state["interval"] * 2))
+        state["next_start"] = max(state["next_start"], now + state["interval"])
+
+        reason = "latency spike" if latency_spike else f"HTTP {status_code}" if status_code else "connection error"
+        self.logger.info(f"Backing off {host} after {reason}: limit {int(state['limit'])}, interval {state['interval']:.2f}s")
+
+    def snapshot(self) -> dict:
+        with self.condition:
+            return {
+                host: {
+                    "limit": int(state["limit"]),
+                    "interval": round(state["interval"], 3),
+                    "requests": state["requests"],
+                    "throttled": state["throttled"],
+                    "errors": state["errors"],
+                    "avg_latency": round(state["total_latency"] / state["requests"], 3) if state["requests"] else None
+                }
+                for host, state in self.hosts.items()
+            }
 
 class BandcampJSON:
     def __init__(self, body, debugging: bool = False):
@@ -77,17 +351,106 @@ class BandcampJSON:
             return "{}"
 
 
+def intern_value(value):
+    # Label, artist, tag and duration strings repeat across thousands of tracks;
+    # interning makes every record share one copy of each.
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class Track:
+    title: str
+    duration: str
+    lyrics: Optional[str]
+    label: Optional[str]
+    track_id: Optional[int]
+    track_num: str
+    artist: Optional[str]
+    url: Optional[str]
+    page_fetched: bool = False
+    track_cover_url_0: Optional[str] = None
+    art_id: Optional[int] = None
+    about: Optional[str] = None
+    credits: Optional[str] = None
+    license: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        track_dict = {
+            "title": self.title,
+            "duration": self.duration,
+            "lyrics": self.lyrics,
+            "label": self.label,
+            "track_id": self.track_id,
+            "track_num": self.track_num,
+            "artist": self.artist,
+            "url": self.url
+        }
+        if self.page_fetched:
+            track_dict["trackCoverUrl_0"] = self.track_cover_url_0
+            track_dict["art_id"] = self.art_id
+            track_dict["about"] = self.about
+            track_dict["credits"] = self.credits
+            track_dict["license"] = self.license
+        return track_dict
+
+
+@dataclass(slots=True)
+class Release:
+    url: str
+    title: str
+    artist: str
+    label: Optional[str]
+    classification: Optional[str]
+    tags: tuple
+    item_id: Optional[int]
+    art_id: Optional[int]
+    is_preorder: Optional[bool]
+    date_published: Optional[str]
+    about: Optional[str]
+    credits: Optional[str]
+    license: Optional[str]
+    cover_url_0: str
+    trackinfo: List[Track] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "title": self.title,
+            "artist": self.artist,
+            "label": self.label,
+            "classification": self.classification,
+            "tags": list(self.tags),
+            "item_id": self.item_id,
+            "art_id": self.art_id,
+            "is_preorder": self.is_preorder,
+            "datePublished": self.date_published,
+            "about": self.about,
+            "credits": self.credits,
+            "license": self.license,
+            "coverUrl_0": self.cover_url_0,
+            "trackinfo": [track.to_dict() for track in self.trackinfo]
+        }
+
+
 class Bandcamp:
-    def __init__(self, delay_arg=None, retries=5, retry_delay=5):
+    def __init__(self, delay_arg=None, retries=5, retry_delay=5, rate_controller: Optional[AdaptiveRateController] = None,
+                 pool_hosts: int = 20, pool_size: int = 10, keepalive_idle: int = 60):
+        load_network_dependencies()
         self.headers = {'User-Agent': f'discography-archive-tools/1.0 (https://github.com/jcomicsutils/discography-archive-tools)'}
-        self.soup = None
-        self.tracks = None
+        self._page_state = threading.local()
+        self.release_hints = {}
+        self.band_names = {}  # host -> band name shown in the header of its pages
         self.logger = logging.getLogger("bandcamp-dl").getChild("Main")
         self.delay_arg = delay_arg
         self.max_retries = retries
         self.retry_delay = retry_delay
+        self.rate_controller = rate_controller
+        self.delay_lock = threading.Lock()
+        self.next_request_at = 0.0
         
-        ctx = create_urllib3_context()
+        ctx = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+        ctx.options |= ssl.OP_NO_COMPRESSION
         ctx.load_default_certs()
         DEFAULT_CIPHERS = ":".join([
             "ECDHE+AESGCM", "ECDHE+CHACHA20", "DHE+AESGCM", "DHE+CHACHA20",
@@ -96,8 +459,33 @@ class Bandcamp:
         ])
         ctx.set_ciphers(DEFAULT_CIPHERS)
         self.session = requests.Session()
-        self.adapter = SSLAdapter(ssl_context=ctx)
+        self.ssl_context = ctx
+        self.adapter = SSLAdapter(ssl_context=ctx, keepalive_idle=keepalive_idle, pool_connections=pool_hosts, pool_maxsize=pool_size)
         self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.artist_images = None
+
+    # The page being parsed is kept per thread so releases can be parsed concurrently.
+    @property
+    def soup(self):
+        return getattr(self._page_state, 'soup', None)
+
+    @soup.setter
+    def soup(self, value):
+        self._page_state.soup = value
+
+    @property
+    def tracks(self):
+        return getattr(self._page_state, 'tracks', None)
+
+    @tracks.setter
+    def tracks(self, value):
+        self._page_state.tracks = value
+
+    def remember_band_name(self, page_url: str, soup: bs4.BeautifulSoup):
+        band_name_element = soup.select_one('p#band-name-location span.title')
+        if band_name_element and band_name_element.text:
+            self.band_names[urlparse(page_url).netloc] = band_name_element.text.strip()
 
     def _apply_delay(self):
         if not self.delay_arg:
@@ -124,25 +512,63 @@ class Bandcamp:
             self.logger.warning(f"Invalid delay values. Using 1000-3000 ms.")
             min_delay_ms, max_delay_ms = 1000, 3000
 
-        sleep_time_ms = random.uniform(min_delay_ms, max_delay_ms)
-        self.logger.info(f"Delaying for {sleep_time_ms:.2f} ms...")
-        time.sleep(sleep_time_ms / 1000) # time.sleep expects seconds
-
-    def _session_get(self, *args, **kwargs):
-        self._apply_delay()
+        # Release and discovery workers share one schedule, so the delay spaces out the
+        # requests of the whole run rather than those of each thread.
+        delay_ms = random.uniform(min_delay_ms, max_delay_ms)
+        with self.delay_lock:
+            now = time.monotonic()
+            start_at = max(now, self.next_request_at)
+            self.next_request_at = start_at + delay_ms / 1000
+
+        if start_at > now:
+            self.logger.info(f"Delaying for {(start_at - now) * 1000:.2f} ms...")
+            time.sleep(start_at - now) # time.sleep expects seconds
+
+    def _controlled_get(self, *args, **kwargs):
+        if not self.rate_controller:
+            return self.session.get(*args, **kwargs)
+
+        host = self.rate_controller.acquire(kwargs.get('url', args[0] if args else ''))
+        started = time.monotonic()
+        status_code = None
+        retry_after = None
+        try:
+            response = self.session.get(*args, **kwargs)
+            status_code = response.status_code
+            if status_code in (429, 503):
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            return response
+        finally:
+            self.rate_controller.release(host, time.monotonic() - started, status_code, retry_after)
+
+    def _session_get(self, *args, no_retry_statuses: tuple = (), **kwargs):
+        if not self.rate_controller:
+            self._apply_delay()
         
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
+            response = None
             try:
-                response = self.session.get(*args, **kwargs)
+                response = self._controlled_get(*args, **kwargs)
                 
                 if response.status_code == 429:
-                    if attempt < self.max_retries:
+                    if attempt < self.max_retries and self.rate_controller and parse_retry_after(response.headers.get('Retry-After')) is not None:
+                        # The controller has already backed off this host and applied the
+                        # Retry-After, so the retry simply waits for its next slot. Without a
+                        # Retry-After the static wait below applies, since the controller's gap
+                        # alone would use up the retries within seconds.
+                        self.logger.warning(
+                            f"Rate limited (HTTP 429). Retrying when the rate controller allows... (Attempt {attempt + 1}/{self.max_retries})"
+                        )
+                        response.close()
+                        continue
+                    elif attempt < self.max_retries:
                         wait_time = self.retry_delay * (attempt + 1)
                         self.logger.warning(
                             f"Rate limited (HTTP 429). Retrying in {wait_time} seconds... (Attempt {attempt + 1}/{self.max_retries})"
                         )
+                        response.close()
                         time.sleep(wait_time)
                         continue
                     else:
@@ -153,7 +579,13 @@ class Bandcamp:
                 return response
             
             except requests.exceptions.RequestException as e:
+                # A failed response still holds its pooled connection (streamed responses
+                # are never read to the end), so hand it back before retrying or raising.
+                if response is not None:
+                    response.close()
                 last_exception = e
+                if response is not None and response.status_code in no_retry_statuses:
+                    raise
                 if attempt < self.max_retries:
                     wait_time = self.retry_delay * (attempt + 1)
                     self.logger.warning(f"Request failed ({e}). Retrying in {wait_time} seconds... (Attempt {attempt + 1}/{self.max_retries})")
@@ -168,6 +600,17 @@ class Bandcamp:
 
     def get_album_urls_from_artist_page(self, artist_url: str) -> List[str]:
         album_urls = set()
+        discovered_keys = set()
+
+        def add_discovered(full_url: str, item_type: Optional[str], item_id):
+            full_url = canonicalize_url(full_url)
+            item_key = f"{item_type}-{item_id}" if item_type and item_id else None
+            if item_key:
+                if item_key in discovered_keys and full_url not in album_urls:
+                    return
+                discovered_keys.add(item_key)
+                self.release_hints[full_url] = {'type': item_type, 'item_key': item_key}
+            album_urls.add(full_url)
         
         parsed_url = urlparse(artist_url)
         if not parsed_url.path or parsed_url.path == "/":
@@ -187,6 +630,10 @@ class Bandcamp:
             soup = bs4.BeautifulSoup(response.text, "lxml")
         except bs4.FeatureNotFound:
             soup = bs4.BeautifulSoup(response.text, "html.parser")
+
+        self.remember_band_name(artist_url, soup)
+        if self.artist_images:
+            self.artist_images.add_candidates(artist_url, soup)
             
         music_grid = soup.find('ol', {'id': 'music-grid'})
         if not music_grid:
@@ -200,8 +647,7 @@ class Bandcamp:
                 items = json.loads(json_string)
                 for item in items:
                     if 'page_url' in item:
-                        full_url = urljoin(music_page_url, item['page_url'])
-                        album_urls.add(full_url)
+                        add_discovered(urljoin(music_page_url, item['page_url']), item.get('type'), item.get('id'))
             except (json.JSONDecodeError, TypeError) as e:
                 self.logger.error(f"Failed to parse data-client-items JSON: {e}")
         
@@ -209,14 +655,42 @@ class Bandcamp:
         for a in music_grid.select('li.music-grid-item a'):
             href = a.get('href')
             if href:
-                full_url = urljoin(music_page_url, href)
-                album_urls.add(full_url)
+                item_type, _, item_id = (a.find_parent('li').get('data-item-id') or '').partition('-')
+                add_discovered(urljoin(music_page_url, href), item_type or None, item_id or None)
 
         self.logger.info(f"Found a total of {len(album_urls)} unique album/track links.")
         return list(album_urls)
 
 
-    def parse(self, url: str, fetch_track_art: bool = False, debugging: bool = False) -> Union[dict, None]:
+    def get_artist_urls_from_label_page(self, label_url: str) -> List[str]:
+        label_host = urlparse(label_url).netloc
+        artists_page_url = urlunparse(urlparse(label_url)._replace(path="/artists"))
+        self.logger.info(f"Scraping label roster from: {artists_page_url}")
+
+        try:
+            response = self._session_get(artists_page_url, headers=self.headers, no_retry_statuses=(404,))
+        except requests.exceptions.RequestException as e:
+            if e.response is not None and e.response.status_code == 404:
+                self.logger.info(f"{label_url} has no artist roster, treating it as an artist page.")
+            else:
+                self.logger.error(f"Could not fetch label roster {artists_page_url}: {e}")
+            return []
+
+        try:
+            soup = bs4.BeautifulSoup(response.text, "lxml")
+        except bs4.FeatureNotFound:
+            soup = bs4.BeautifulSoup(response.text, "html.parser")
+
+        artist_urls = []
+        for a in soup.select('.artists-grid a[href]'):
+            artist_url = canonicalize_url(urljoin(artists_page_url, a['href']))
+            if urlparse(artist_url).netloc != label_host and artist_url not in artist_urls:
+                artist_urls.append(artist_url)
+
+        self.logger.info(f"Found {len(artist_urls)} artists on the label roster.")
+        return artist_urls
+
+    def parse(self, url: str, fetch_track_art: bool = False, debugging: bool = False) -> Union[Release, None]:
         try:
             response = self._session_get(url, headers=self.headers)
         except requests.exceptions.RequestException as e:
@@ -228,6 +702,10 @@ class Bandcamp:
         except bs4.FeatureNotFound:
             self.soup = bs4.BeautifulSoup(response.text, "html.parser")
 
+        self.remember_band_name(url, self.soup)
+        if self.artist_images:
+            self.artist_images.add_candidates(url, self.soup)
+
         self.logger.debug(" Generating BandcampJSON..")
         bandcamp_json = BandcampJSON(self.soup, debugging).generate()
         
@@ -271,26 +749,25 @@ class Bandcamp:
                     album_title = 'Untitled'
         
         album_art_url = self.get_art_from_page(self.soup)
-        album_artist = page_json.get('artist', 'Unknown Artist')
-        album_label = self.get_label_from_html(self.soup, page_json)
-
-        album = {
-            "url": url,
-            "title": album_title,
-            "artist": album_artist,
-            "label": album_label,
-            "classification": self.get_classification(page_json),
-            "tags": page_json.get('keywords', []),
-            "item_id": page_json.get('current', {}).get('id'),
-            "art_id": page_json.get('art_id'),
-            "is_preorder": page_json.get('is_preorder'),
-            "datePublished": album_release,
-            "about": self.get_about_from_html(),
-            "credits": self.get_credits_from_html(),
-            "license": self.get_license_from_html(self.soup),
-            "coverUrl_0": album_art_url.replace(".jpg", ""), # Match JS format
-            "trackinfo": []
-        }
+        album_artist = intern_value(page_json.get('artist', 'Unknown Artist'))
+        album_label = intern_value(self.get_label_from_html(self.soup, page_json))
+
+        album = Release(
+            url=url,
+            title=album_title,
+            artist=album_artist,
+            label=album_label,
+            classification=intern_value(self.get_classification(page_json)),
+            tags=tuple(intern_value(tag) for tag in page_json.get('keywords', [])),
+            item_id=page_json.get('current', {}).get('id'),
+            art_id=page_json.get('art_id'),
+            is_preorder=page_json.get('is_preorder'),
+            date_published=album_release,
+            about=self.get_about_from_html(),
+            credits=self.get_credits_from_html(),
+            license=intern_value(self.get_license_from_html(self.soup)),
+            cover_url_0=album_art_url.replace(".jpg", ""), # Match JS format
+        )
         
         base_url = urlparse(url)._replace(query="", fragment="").geturl()
 
@@ -298,7 +775,7 @@ class Bandcamp:
             if track_data.get('file'): 
                 if fetch_track_art:
                     print(f"    -> Processing track {i+1}/{len(self.tracks)}: {track_data.get('title')}")
-                album['trackinfo'].append(self.get_track_metadata(track_data, album_art_url, base_url, fetch_track_art, album_artist, album_label))
+                album.trackinfo.append(self.get_track_metadata(track_data, album_art_url, base_url, fetch_track_art, album_artist, album_label))
 
         return album
 
@@ -377,7 +854,7 @@ class Bandcamp:
         
         return page_json.get('item_sellers', {}).get(str(page_json.get("band_id")), {}).get('name')
 
-    def get_track_metadata(self, track: dict, album_art_url: str, base_url: str, fetch_track_art: bool, album_artist: str, album_label: str) -> dict:
+    def get_track_metadata(self, track: dict, album_art_url: str, base_url: str, fetch_track_art: bool, album_artist: str, album_label: str) -> Track:
         self.logger.debug(" Generating track metadata..")
         
         duration_seconds = track.get('duration', 0)
@@ -409,18 +886,18 @@ class Bandcamp:
             track_artist = album_artist
         
         track_page_link = track.get('title_link')
-        full_track_url = urljoin(base_url, track_page_link) if track_page_link else None
-
-        track_metadata = {
-            "title": track_title,
-            "duration": duration_str,
-            "lyrics": lyrics_text,
-            "label": album_label, 
-            "track_id": track.get('id'),
-            "track_num": str(track.get('track_num', 'N/A')),
-            "artist": track_artist, 
-            "url": full_track_url
-        }
+        full_track_url = canonicalize_url(urljoin(base_url, track_page_link)) if track_page_link else None
+
+        track_metadata = Track(
+            title=track_title,
+            duration=intern_value(duration_str),
+            lyrics=lyrics_text,
+            label=album_label,
+            track_id=track.get('id'),
+            track_num=intern_value(str(track.get('track_num', 'N/A'))),
+            artist=intern_value(track_artist),
+            url=full_track_url
+        )
         
         if fetch_track_art:
             track_cover_url = album_art_url 
@@ -453,17 +930,18 @@ class Bandcamp:
                         
                         track_label = self.get_label_from_html(track_soup, track_page_json)
                         if track_label:
-                            track_metadata["label"] = track_label
+                            track_metadata.label = intern_value(track_label)
 
 
                 except Exception as e:
                     self.logger.warning(f"Failed to fetch individual page for track '{track_title}': {e}")
             
-            track_metadata["trackCoverUrl_0"] = track_cover_url.replace(".jpg", "")
-            track_metadata["art_id"] = track_art_id
-            track_metadata["about"] = track_about
-            track_metadata["credits"] = track_credits
-            track_metadata["license"] = track_license
+            track_metadata.page_fetched = True
+            track_metadata.track_cover_url_0 = track_cover_url.replace(".jpg", "")
+            track_metadata.art_id = track_art_id
+            track_metadata.about = track_about
+            track_metadata.credits = track_credits
+            track_metadata.license = intern_value(track_license)
 
         return track_metadata
 
@@ -486,7 +964,7 @@ class Bandcamp:
     def get_album_art(self) -> str:
         return self.get_art_from_page(self.soup)
 
-def get_bandcamp_data(url: str, fetch_track_art: bool, bandcamp_parser: Bandcamp) -> Union[dict, None]:
+def get_bandcamp_data(url: str, fetch_track_art: bool, bandcamp_parser: Bandcamp) -> Union[Release, None]:
     album_data = bandcamp_parser.parse(url, fetch_track_art=fetch_track_art)
     return album_data
 
@@ -542,16 +1020,130 @@ def create_and_truncate_filename(artist, title, item_id, is_track=False, track_i
 
     return create_safe_filename(final_filename_str)
 
+def serialize_record(obj) -> dict:
+    if isinstance(obj, (Release, Track)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 def save_data_to_json(data: Union[dict, list], filename: str):
     try:
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            json.dump(data, f, indent=4, ensure_ascii=False, default=serialize_record)
         print(f"--- Successfully saved data to {filename} ---")
     except IOError as e:
         print(f"--- Error: Could not save data to {filename}. Reason: {e} ---")
     except TypeError as e:
         print(f"--- Error: Could not serialize data to JSON. Reason: {e} ---")
 
+class ReleaseArchive:
+    # Releases are stored as one gzip member per release, so the data file is also a
+    # valid gzip stream of JSON lines. The index is a JSON lines file mapping item_id,
+    # URL and title to the byte range of each member; both files are only ever appended to.
+    # A release is only appended again when its data has changed since its latest entry.
+    DATA_SUFFIX = ".releases.jsonl.gz"
+    INDEX_SUFFIX = ".releases.idx"
+
+    def __init__(self, base_path: str):
+        if base_path.endswith(self.DATA_SUFFIX):
+            base_path = base_path[:-len(self.DATA_SUFFIX)]
+        self.data_path = base_path + self.DATA_SUFFIX
+        self.index_path = base_path + self.INDEX_SUFFIX
+        self.artist = None
+        self.entries = []
+        self.latest = {}  # release key -> position of its latest entry
+        self.load_index()
+
+    def load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if 'artist' in entry:
+                    self.artist = entry['artist']
+                else:
+                    self.latest[self.entry_key(entry)] = len(self.entries)
+                    self.entries.append(entry)
+
+    def entry_key(self, entry: dict) -> str:
+        # Album and track ids are separate sequences, so the key includes the item type.
+        return entry.get('key') or release_key(entry['url'], entry['item_id']) or entry['url']
+
+    def serialize(self, release_dict: dict) -> bytes:
+        return (json.dumps(release_dict, ensure_ascii=False) + "\n").encode('utf-8')
+
+    def append(self, release: Release, artist: str) -> bool:
+        payload = self.serialize(release.to_dict())
+        digest = hashlib.md5(payload).hexdigest()
+        key = release_key(release.url, release.item_id) or release.url
+
+        position = self.latest.get(key)
+        if position is not None:
+            latest_entry = self.entries[position]
+            latest_digest = latest_entry.get('md5') or hashlib.md5(self.serialize(self.read_entry(latest_entry))).hexdigest()
+            if latest_digest == digest:
+                return False
+
+        frame = gzip.compress(payload)
+        with open(self.data_path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(frame)
+
+        entry = {"key": key, "item_id": release.item_id, "url": release.url, "title": release.title, "md5": digest, "offset": offset, "length": len(frame)}
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            if self.artist is None:
+                f.write(json.dumps({"artist": artist}, ensure_ascii=False) + "\n")
+                self.artist = artist
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.latest[key] = len(self.entries)
+        self.entries.append(entry)
+        return True
+
+    def find(self, key) -> Optional[dict]:
+        # Later entries supersede earlier ones for the same release.
+        for entry in reversed(self.entries):
+            if key in (self.entry_key(entry), entry['url'], entry['title']) or str(key) == str(entry['item_id']):
+                return entry
+        return None
+
+    def read_entry(self, entry: dict, data_file=None) -> dict:
+        if data_file is None:
+            with open(self.data_path, 'rb') as f:
+                return self.read_entry(entry, f)
+        data_file.seek(entry['offset'])
+        return json.loads(gzip.decompress(data_file.read(entry['length'])))
+
+    def read(self, key) -> Optional[dict]:
+        entry = self.find(key)
+        return self.read_entry(entry) if entry else None
+
+    def iter_releases(self):
+        with open(self.data_path, 'rb') as f:
+            for position in sorted(self.latest.values()):
+                yield self.read_entry(self.entries[position], f)
+
+    def export_json(self, filename: str):
+        save_data_to_json({self.artist or 'Unknown_Artist': list(self.iter_releases())}, filename)
+
+def print_request_metrics(bandcamp_parser: Bandcamp):
+    if bandcamp_parser.rate_controller:
+        print("\n--- Request metrics per host ---")
+        for host, metrics in bandcamp_parser.rate_controller.snapshot().items():
+            print(f"  {host}: {metrics['requests']} requests, {metrics['throttled']} rate limited, {metrics['errors']} errors, "
+                  f"avg latency {metrics['avg_latency']}s, final limit {metrics['limit']}, interval {metrics['interval']}s")
+
+    print("\n--- Connection metrics per host ---")
+    handshakes = bandcamp_parser.ssl_context.handshakes
+    for host, request_count in sorted(bandcamp_parser.adapter.request_counts.items()):
+        full_handshakes, resumed_handshakes = handshakes.get(host, [0, 0])
+        connections = full_handshakes + resumed_handshakes
+        reuse_rate = (1 - connections / request_count) * 100 if connections else None
+        reuse_text = f", connection reuse {reuse_rate:.1f}%" if reuse_rate is not None else ""
+        print(f"  {host}: {request_count} requests, {full_handshakes} full TLS handshakes, {resumed_handshakes} resumed{reuse_text}")
+    print(f"  DNS cache: {DNS_CACHE.lookups} lookups, {DNS_CACHE.hits} served from cache")
+
 def save_url_list(urls: List[str], filename: str):
     try:
         with open(filename, 'w', encoding='utf-8') as f:
@@ -573,10 +1165,200 @@ def save_removed_log(log_entries: List[str], filename: str):
     except IOError as e:
         print(f"--- Error: Could not save removed log to {filename}. Reason: {e} ---")
 
+def canonicalize_url(url: str) -> str:
+    # The same page is reachable over http and https, with upper-case hosts, default
+    # ports, tracking query strings (?from=, ?label=) and trailing slashes.
+    parsed_url = urlparse(url.strip())
+    if not parsed_url.scheme:
+        parsed_url = urlparse(f"https://{url.strip()}")
+    host = (parsed_url.hostname or '').lower()
+    if parsed_url.port and parsed_url.port not in (80, 443):
+        host = f"{host}:{parsed_url.port}"
+    path = re.sub(r'/+', '/', parsed_url.path).rstrip('/') or '/'
+    return urlunparse(('https', host, path, '', '', ''))
+
+def release_key(url: str, item_id) -> Optional[str]:
+    if item_id is None:
+        return None
+    item_type = 'track' if urlparse(url).path.startswith('/track/') else 'album'
+    return f"{item_type}-{item_id}"
+
+class ReleaseRegistry:
+    # Tracks which release (by item type and id) each canonical URL points to, so a
+    # release reached through both a custom domain and its *.bandcamp.com subdomain is
+    # fetched and stored once. Alias URLs map to the URL the release was kept under.
+    ALIASES_NAME = ".url-aliases.json"
+
+    def __init__(self, release_hints: dict):
+        self.release_hints = release_hints
+        self.claimed = {}  # item key -> URL the release is kept under
+        self.aliases = {}
+        self.admitted = set()
+        self.lock = threading.Lock()
+
+    def load_aliases(self, folder_path: str):
+        aliases_path = os.path.join(folder_path, self.ALIASES_NAME)
+        if os.path.exists(aliases_path):
+            try:
+                with open(aliases_path, 'r', encoding='utf-8') as f:
+                    self.aliases.update(json.load(f))
+            except (IOError, ValueError) as e:
+                print(f"--- Error: Could not read URL aliases from {aliases_path}. Reason: {e} ---")
+
+    def save_aliases(self, folder_path: str):
+        if not self.aliases:
+            return
+        aliases_path = os.path.join(folder_path, self.ALIASES_NAME)
+        try:
+            with open(aliases_path, 'w', encoding='utf-8') as f:
+                json.dump(self.aliases, f, indent=4, ensure_ascii=False)
+        except IOError as e:
+            print(f"--- Error: Could not save URL aliases to {aliases_path}. Reason: {e} ---")
+
+    def admit(self, url: str) -> Optional[str]:
+        # Collapses known aliases and discovered URLs that share an item key before anything
+        # is fetched. Returns the URL to process, or None if the release is already queued.
+        url = self.aliases.get(url, url)
+        with self.lock:
+            if url in self.admitted:
+                return None
+            self.admitted.add(url)
+        if self.claim(url, self.release_hints.get(url, {}).get('item_key')):
+            return None
+        return url
+
+    def claim(self, url: str, item_key: Optional[str]) -> Optional[str]:
+        # Returns the URL the release is already kept under, or None if this URL now owns it.
+        if not item_key:
+            return None
+        with self.lock:
+            owner = self.claimed.setdefault(item_key, url)
+            if owner == url:
+                return None
+            self.aliases[url] = owner
+            return owner
+
+    def unclaim(self, url: str, item_key: Optional[str]):
+        with self.lock:
+            if item_key and self.claimed.get(item_key) == url:
+                del self.claimed[item_key]
+
+class ReleaseDiscovery:
+    # Discovers release URLs from the input pages on a thread pool, optionally expanding
+    # label rosters into their artists' pages first. All requests go through the parser,
+    # so they share its rate limiting; URLs are queued as soon as each page is done.
+    def __init__(self, bandcamp_parser: 'Bandcamp', workers: int = 1, expand_labels: bool = False):
+        self.bandcamp_parser = bandcamp_parser
+        self.expand_labels = expand_labels
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.urls = queue.Queue()
+        self.pending_tasks = 1  # the start() call itself
+        self.music_pages = {}  # /music page -> artist URL it was discovered from
+        self.lock = threading.Lock()
+        self.finished = False
+
+    def start(self, input_urls: List[str]):
+        for url in input_urls:
+            if not is_artist_page(url):
+                self.urls.put(url)
+            elif self.expand_labels:
+                self._submit(self._expand_label, url)
+            else:
+                self._submit(self._discover_artist, url)
+        self._task_done()
+
+    def _submit(self, task, url: str):
+        with self.lock:
+            self.pending_tasks += 1
+        self.executor.submit(self._run, task, url)
+
+    def _run(self, task, url: str):
+        try:
+            task(url)
+        except Exception as e:
+            print(f"  -> Discovery failed for {url}. Error: {e}")
+        finally:
+            self._task_done()
+
+    def _task_done(self):
+        with self.lock:
+            self.pending_tasks -= 1
+            if self.pending_tasks == 0:
+                self.urls.put(None)
+
+    def _expand_label(self, label_url: str):
+        print(f"Expanding label roster: {label_url}")
+        self._submit(self._discover_artist, label_url)
+        for artist_url in self.bandcamp_parser.get_artist_urls_from_label_page(label_url):
+            self._submit(self._discover_artist, artist_url)
+
+    def _discover_artist(self, artist_url: str):
+        music_page_url = urlunparse(urlparse(artist_url)._replace(path="/music"))
+        with self.lock:
+            source_url = self.music_pages.setdefault(music_page_url, artist_url)
+        if source_url != artist_url:
+            if self.bandcamp_parser.artist_images:
+                self.bandcamp_parser.artist_images.add_alias(artist_url, source_url)
+            return
+
+        print(f"Discovering releases on artist page: {artist_url}")
+        for album_url in self.bandcamp_parser.get_album_urls_from_artist_page(artist_url):
+            self.urls.put(album_url)
+
+    def take(self, timeout: Optional[float] = None) -> List[str]:
+        # Returns the URLs discovered so far, waiting up to `timeout` seconds (forever if
+        # None) for the first one. Sets `finished` once every discovery task is done.
+        discovered = []
+        while not self.finished:
+            try:
+                if discovered or timeout == 0:
+                    url = self.urls.get_nowait()
+                else:
+                    url = self.urls.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if url is None:
+                self.finished = True
+                self.executor.shutdown(wait=False)
+            else:
+                discovered.append(url)
+        return discovered
+
 def is_artist_page(url: str) -> bool:
     parsed_url = urlparse(url)
     return parsed_url.path in ["", "/", "/music", "/music/"]
 
+def load_release_costs(folder_path: str) -> dict:
+    costs_path = os.path.join(folder_path, ".release-costs.json")
+    if not os.path.exists(costs_path):
+        return {}
+    try:
+        with open(costs_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (IOError, ValueError) as e:
+        print(f"--- Error: Could not read release costs from {costs_path}. Reason: {e} ---")
+        return {}
+
+def save_release_costs(release_costs: dict, folder_path: str):
+    costs_path = os.path.join(folder_path, ".release-costs.json")
+    try:
+        with open(costs_path, 'w', encoding='utf-8') as f:
+            json.dump(release_costs, f, ensure_ascii=False)
+    except IOError as e:
+        print(f"--- Error: Could not save release costs to {costs_path}. Reason: {e} ---")
+
+def estimate_release_cost(url: str, fetch_track_art: bool, release_hints: dict, release_costs: dict) -> int:
+    # Estimated number of requests needed to process a release: the release page itself,
+    # plus one page per track when individual track pages are fetched.
+    if not fetch_track_art:
+        return 1
+    if url in release_costs:
+        return 1 + release_costs[url]
+    release_type = release_hints.get(url, {}).get('type')
+    if release_type == 'track' or (release_type is None and '/track/' in urlparse(url).path):
+        return 2
+    return 1 + 10
+
 def calculate_md5(filepath: str) -> str:
     hash_md5 = hashlib.md5()
     try:
@@ -588,6 +1370,174 @@ def calculate_md5(filepath: str) -> str:
         print(f"    -> Could not read file {filepath} to calculate hash. Error: {e}")
         return ""
 
+def perceptual_hash_available() -> bool:
+    try:
+        import numpy
+        from PIL import Image
+    except ImportError:
+        return False
+    return True
+
+def calculate_dhashes(filepaths: List[str]) -> List[Optional[int]]:
+    # 64-bit difference hashes, computed for the whole batch at once: every image is
+    # reduced to a 9x8 grayscale thumbnail and the horizontal gradients are packed into bits.
+    import numpy as np
+    from PIL import Image
+
+    thumbnails = []
+    loaded_indexes = []
+    for i, filepath in enumerate(filepaths):
+        try:
+            with Image.open(filepath) as img:
+                thumbnails.append(np.asarray(img.convert('L').resize((9, 8), Image.LANCZOS), dtype=np.int16))
+            loaded_indexes.append(i)
+        except (IOError, OSError, ValueError) as e:
+            print(f"    -> Could not read image {filepath} to calculate perceptual hash. Error: {e}")
+
+    hashes = [None] * len(filepaths)
+    if not thumbnails:
+        return hashes
+
+    pixels = np.stack(thumbnails)
+    gradient_bits = (pixels[:, :, 1:] > pixels[:, :, :-1]).reshape(len(thumbnails), 64)
+    packed = np.packbits(gradient_bits, axis=1).view('>u8').ravel()
+    for i, value in zip(loaded_indexes, packed.tolist()):
+        hashes[i] = int(value)
+    return hashes
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    return bin(hash_a ^ hash_b).count('1')
+
+class BKTree:
+    def __init__(self):
+        # Each node is [hash, value, {distance: child_node}].
+        self.root = None
+        self.size = 0
+
+    def add(self, item_hash: int, value):
+        node = [item_hash, value, {}]
+        self.size += 1
+        if self.root is None:
+            self.root = node
+            return
+
+        current = self.root
+        while True:
+            distance = hamming_distance(item_hash, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def query(self, item_hash: int, max_distance: int) -> List[tuple]:
+        matches = []
+        if self.root is None:
+            return matches
+
+        stack = [self.root]
+        while stack:
+            node_hash, value, children = stack.pop()
+            distance = hamming_distance(item_hash, node_hash)
+            if distance <= max_distance:
+                matches.append((distance, node_hash, value))
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+class CoverHashIndex:
+    def __init__(self, index_path: str, threshold: int = 6, action: str = 'link'):
+        self.index_path = index_path
+        self.base_dir = os.path.dirname(os.path.abspath(index_path))
+        self.threshold = threshold
+        self.action = action
+        self.tree = BKTree()
+        # Release workers look up and add covers concurrently.
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get('covers', [])
+            for hex_hash, relative_path in entries:
+                self.tree.add(int(hex_hash, 16), relative_path)
+            print(f"--- Loaded {self.tree.size} perceptual cover hashes from {self.index_path} ---")
+        except (IOError, ValueError, TypeError, AttributeError) as e:
+            print(f"--- Error: Could not load perceptual hash index {self.index_path}. Reason: {e} ---")
+
+    def save(self):
+        entries = []
+        stack = [self.tree.root] if self.tree.root else []
+        while stack:
+            node_hash, relative_path, children = stack.pop()
+            entries.append([f"{node_hash:016x}", relative_path])
+            stack.extend(children.values())
+        try:
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump({'covers': entries}, f, ensure_ascii=False)
+            print(f"--- Saved {len(entries)} perceptual cover hashes to {self.index_path} ---")
+        except IOError as e:
+            print(f"--- Error: Could not save perceptual hash index to {self.index_path}. Reason: {e} ---")
+
+    def find_duplicate(self, cover_hash: int, filepath: str) -> Optional[tuple]:
+        own_path = os.path.abspath(filepath)
+        for distance, _, relative_path in self.tree.query(cover_hash, self.threshold):
+            existing_path = os.path.join(self.base_dir, relative_path)
+            if os.path.abspath(existing_path) != own_path and is_album_cover_file(existing_path) and os.path.exists(existing_path):
+                return distance, existing_path
+        return None
+
+    def add(self, cover_hash: int, filepath: str):
+        self.tree.add(cover_hash, os.path.relpath(os.path.abspath(filepath), self.base_dir))
+
+def is_album_cover_file(filepath: str) -> bool:
+    # Album covers sit directly in the artist's cover folder, or carry the name of the
+    # per-album subfolder they share with the release's track art.
+    folder_path = os.path.dirname(os.path.abspath(filepath))
+    return is_cover_folder(folder_path) or os.path.splitext(os.path.basename(filepath))[0] == os.path.basename(folder_path)
+
+def dedupe_covers_perceptually(filepaths: List[str], cover_index: CoverHashIndex):
+    filepaths = [f for f in filepaths if f and os.path.exists(f)]
+    if not filepaths:
+        return
+
+    for filepath, cover_hash in zip(filepaths, calculate_dhashes(filepaths)):
+        if cover_hash is None:
+            continue
+
+        # Album covers are only indexed, never replaced: releases built from one cover
+        # template still have their own art. Track art is matched against album covers,
+        # which catches track art that is an album cover re-encoded or resized.
+        with cover_index.lock:
+            duplicate = None if is_album_cover_file(filepath) else cover_index.find_duplicate(cover_hash, filepath)
+            if not duplicate:
+                cover_index.add(cover_hash, filepath)
+        if not duplicate:
+            continue
+
+        distance, existing_path = duplicate
+        try:
+            if cover_index.action == 'link':
+                linked_path = os.path.splitext(filepath)[0] + os.path.splitext(existing_path)[1]
+                temp_path = linked_path + ".link"
+                os.link(existing_path, temp_path)
+                os.replace(temp_path, linked_path)
+                if linked_path != filepath:
+                    os.remove(filepath)
+                print(f"    -> Linked near-duplicate cover {os.path.basename(linked_path)} to {os.path.basename(existing_path)} (distance {distance})")
+            else:
+                os.remove(filepath)
+                print(f"    -> Dropped near-duplicate cover {os.path.basename(filepath)} of {os.path.basename(existing_path)} (distance {distance})")
+        except OSError as e:
+            print(f"    -> Error handling near-duplicate cover {filepath}: {e}")
+
 def get_extension_from_mime_type(mime_type: str) -> str:
     if not mime_type:
         return 'jpg'
@@ -604,41 +1554,43 @@ def get_high_res_url(image_url: str) -> Optional[str]:
         return None
     return re.sub(r'_\d+(\.\w+)$', r'_0\1', image_url)
 
-def download_image(image_url: str, folder_path: str, base_filename: str, bandcamp_parser: Bandcamp):
+def download_image(image_url: str, folder_path: str, base_filename: str, bandcamp_parser: Bandcamp) -> Optional[str]:
     if not image_url or "Album art not found" in image_url:
-        return
+        return None
         
     try:
-        response = bandcamp_parser._session_get(image_url, stream=True)
-        response.raise_for_status()
-        
-        content_type = response.headers.get('content-type')
-        extension = get_extension_from_mime_type(content_type)
-        
-        filename = f"{base_filename}.{extension}"
-        filepath = os.path.join(folder_path, filename)
+        with bandcamp_parser._session_get(image_url, stream=True) as response:
+            response.raise_for_status()
+            
+            content_type = response.headers.get('content-type')
+            extension = get_extension_from_mime_type(content_type)
+            
+            filename = f"{base_filename}.{extension}"
+            filepath = os.path.join(folder_path, filename)
 
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            with open(filepath, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
         print(f"    -> Downloaded image: {filename}")
+        return filepath
     except requests.exceptions.RequestException as e:
         print(f"    -> Failed to download image {image_url}. Error: {e}")
+    return None
+
+def normalize_image_url(image_url: str) -> str:
+    bare_url = urlunparse(urlparse(image_url)._replace(scheme='https', query='', fragment=''))
+    return get_high_res_url(bare_url) or bare_url
+
+def find_artist_images(page_url: str, soup: bs4.BeautifulSoup) -> List[tuple]:
+    artist_images = []
 
-def download_artist_images(page_url: str, soup: bs4.BeautifulSoup, artist_folder_path: str, bandcamp_parser: Bandcamp, index: int):
     profile_img_tag = soup.select_one('div.bio-pic a.popupImage')
     if profile_img_tag and profile_img_tag.get('href'):
-        profile_img_url = urljoin(page_url, profile_img_tag['href'])
-        hq_profile_url = get_high_res_url(profile_img_url) or profile_img_url
-        print(f"  -> Found artist profile image: {hq_profile_url}")
-        download_image(hq_profile_url, artist_folder_path, f"Artist Photo_orig ({index})", bandcamp_parser)
+        artist_images.append(("Artist Photo_orig", urljoin(page_url, profile_img_tag['href'])))
 
     banner_img_tag = soup.select_one('#customHeader img')
     if banner_img_tag and banner_img_tag.get('src'):
-        banner_img_url = urljoin(page_url, banner_img_tag['src'])
-        hq_banner_url = get_high_res_url(banner_img_url) or banner_img_url
-        print(f"  -> Found artist banner image: {hq_banner_url}")
-        download_image(hq_banner_url, artist_folder_path, f"Custom Header_orig ({index})", bandcamp_parser)
+        artist_images.append(("Custom Header_orig", urljoin(page_url, banner_img_tag['src'])))
 
     bg_img_url = None
     body_tag = soup.find('body')
@@ -656,26 +1608,160 @@ def download_artist_images(page_url: str, soup: bs4.BeautifulSoup, artist_folder
                 bg_img_url = match.group(1).strip('\'"')
 
     if bg_img_url:
-        bg_img_url = urljoin(page_url, bg_img_url)
-        hq_bg_url = get_high_res_url(bg_img_url) or bg_img_url
-        print(f"  -> Found artist background image: {hq_bg_url}")
-        download_image(hq_bg_url, artist_folder_path, f"Background Image ({index})", bandcamp_parser)
+        artist_images.append(("Background Image", urljoin(page_url, bg_img_url)))
+
+    return [(base_filename, normalize_image_url(image_url)) for base_filename, image_url in artist_images]
+
+class ArtistImageStore:
+    MANIFEST_NAME = ".artist-images.json"
+    FILENAME_PATTERN = re.compile(r'^(Artist Photo_orig|Custom Header_orig|Background Image) \(\d+\)\.\w+$')
+
+    def __init__(self, page_urls: List[str]):
+        self.page_urls = set(page_urls)
+        self.seen_pages = set()
+        self.page_aliases = {}  # input page -> input page whose fetch covers the same /music page
+        self.candidates = {}  # normalized image URL -> base filename, in discovery order
+        self.lock = threading.Lock()
+
+    def add_candidates(self, page_url: str, soup: bs4.BeautifulSoup):
+        # Called with every page the parser has already fetched; only the pages passed
+        # on the command line are used as sources of artist-level images.
+        with self.lock:
+            if page_url not in self.page_urls or page_url in self.seen_pages:
+                return
+            self.seen_pages.add(page_url)
+            self._add_page_images(page_url, soup)
+
+    def _add_page_images(self, page_url: str, soup: bs4.BeautifulSoup):
+        for base_filename, image_url in find_artist_images(page_url, soup):
+            if image_url not in self.candidates:
+                print(f"  -> Found artist image ({base_filename}): {image_url}")
+                self.candidates[image_url] = base_filename
+
+    def add_alias(self, page_url: str, source_page_url: str):
+        with self.lock:
+            self.page_aliases[page_url] = source_page_url
+
+    def collect_missing_pages(self, bandcamp_parser: Bandcamp):
+        # An alias only counts as collected once the page it shares was fetched successfully.
+        with self.lock:
+            missing_pages = {page_url for page_url in self.page_urls - self.seen_pages if self.page_aliases.get(page_url) not in self.seen_pages}
+        for page_url in sorted(missing_pages):
+            print(f"  -> Checking page for artist images: {page_url}")
+            try:
+                response = bandcamp_parser._session_get(page_url, headers=bandcamp_parser.headers)
+                try:
+                    soup = bs4.BeautifulSoup(response.text, "lxml")
+                except bs4.FeatureNotFound:
+                    soup = bs4.BeautifulSoup(response.text, "html.parser")
+                self.add_candidates(page_url, soup)
+            except Exception as e:
+                print(f"    -> Could not process artist images for {page_url}. Error: {e}")
+
+    def load_manifest(self, manifest_path: str) -> dict:
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, ValueError) as e:
+            print(f"    -> Could not read artist image manifest {manifest_path}. Error: {e}")
+            return {}
+
+    def download_all(self, artist_folder_path: str, bandcamp_parser: Bandcamp):
+        manifest_path = os.path.join(artist_folder_path, self.MANIFEST_NAME)
+        manifest = self.load_manifest(manifest_path)
+        known_hashes = {entry['md5']: entry['file'] for entry in manifest.values() if entry.get('md5')}
+
+        # Images saved before the manifest existed are hashed too, so they aren't saved again.
+        known_files = set(known_hashes.values())
+        for filename in sorted(os.listdir(artist_folder_path)):
+            if filename not in known_files and self.FILENAME_PATTERN.match(filename):
+                file_hash = calculate_md5(os.path.join(artist_folder_path, filename))
+                if file_hash:
+                    known_hashes.setdefault(file_hash, filename)
+
+        for image_url, base_filename in self.candidates.items():
+            known_entry = manifest.get(image_url)
+            if known_entry and os.path.exists(os.path.join(artist_folder_path, known_entry['file'])):
+                print(f"    -> Artist image already saved as {known_entry['file']}, skipping: {image_url}")
+                continue
+
+            entry = self.download_unique_image(image_url, artist_folder_path, self.next_filename(artist_folder_path, base_filename), known_hashes, bandcamp_parser)
+            if entry:
+                manifest[image_url] = entry
+
+        try:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=4, ensure_ascii=False)
+        except IOError as e:
+            print(f"    -> Could not save artist image manifest {manifest_path}. Error: {e}")
+
+    def next_filename(self, folder_path: str, base_filename: str) -> str:
+        existing_files = set(os.path.splitext(f)[0] for f in os.listdir(folder_path))
+        index = 1
+        while f"{base_filename} ({index})" in existing_files:
+            index += 1
+        return f"{base_filename} ({index})"
+
+    def download_unique_image(self, image_url: str, folder_path: str, base_filename: str, known_hashes: dict, bandcamp_parser: Bandcamp) -> Optional[dict]:
+        temp_path = os.path.join(folder_path, f"{base_filename}.part")
+        try:
+            with bandcamp_parser._session_get(image_url, stream=True) as response:
+                hash_md5 = hashlib.md5()
+                with open(temp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        hash_md5.update(chunk)
+                        f.write(chunk)
+            file_hash = hash_md5.hexdigest()
+
+            if file_hash in known_hashes:
+                os.remove(temp_path)
+                print(f"    -> Artist image {image_url} is identical to {known_hashes[file_hash]}, not saving again.")
+                return {'file': known_hashes[file_hash], 'md5': file_hash}
+
+            filename = f"{base_filename}.{get_extension_from_mime_type(response.headers.get('content-type'))}"
+            os.replace(temp_path, os.path.join(folder_path, filename))
+            known_hashes[file_hash] = filename
+            print(f"    -> Downloaded image: {filename}")
+            return {'file': filename, 'md5': file_hash}
+        except (requests.exceptions.RequestException, OSError) as e:
+            print(f"    -> Failed to download image {image_url}. Error: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+COVER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+
+class DownloadedCovers:
+    # Cover URLs already fetched during a run, shared by the release workers so art used
+    # by several releases is downloaded once.
+    def __init__(self):
+        self.urls = set()
+        self.lock = threading.Lock()
 
-def process_album_covers(album_data, base_cover_folder, bandcamp_parser: Bandcamp, fetch_track_art, downloaded_covers, hash_covers):
+    def claim(self, url: str) -> bool:
+        with self.lock:
+            if url in self.urls:
+                return False
+            self.urls.add(url)
+            return True
+
+def process_album_covers(album_data: Release, base_cover_folder, bandcamp_parser: Bandcamp, fetch_track_art, downloaded_covers: DownloadedCovers, hash_covers, cover_index: Optional[CoverHashIndex] = None):
     if not album_data or not base_cover_folder:
         return
 
-    artist = album_data.get('artist', 'Unknown_Artist')
-    title = album_data.get('title', 'Untitled')
-    item_id = album_data.get('item_id')
-    album_art_id = album_data.get('art_id')
-    album_cover_url = album_data.get("coverUrl_0", "") + ".jpg"
-    tracks = album_data.get("trackinfo", [])
+    artist = album_data.artist
+    title = album_data.title
+    item_id = album_data.item_id
+    album_art_id = album_data.art_id
+    album_cover_url = album_data.cover_url_0 + ".jpg"
+    tracks = album_data.trackinfo
 
     has_unique_track_covers = False
     if fetch_track_art:
         for track in tracks:
-            if track.get('art_id') and track.get('art_id') != album_art_id:
+            if track.art_id and track.art_id != album_art_id:
                 has_unique_track_covers = True
                 break  
 
@@ -686,35 +1772,38 @@ def process_album_covers(album_data, base_cover_folder, bandcamp_parser: Bandcam
         os.makedirs(target_folder, exist_ok=True)
         print(f"  -> Album has unique track covers. Saving all covers to: {target_folder}")
 
-    if album_cover_url and "Album art not found" not in album_cover_url and album_cover_url not in downloaded_covers:
+    new_cover_files = []
+
+    if album_cover_url and "Album art not found" not in album_cover_url and downloaded_covers.claim(album_cover_url):
         album_filename_base = create_and_truncate_filename(artist, title, item_id)
-        download_image(album_cover_url, target_folder, album_filename_base, bandcamp_parser)
-        downloaded_covers.add(album_cover_url)
+        new_cover_files.append(download_image(album_cover_url, target_folder, album_filename_base, bandcamp_parser))
 
     if has_unique_track_covers:
         for track in tracks:
-            hq_track_art_id = track.get('art_id')
+            hq_track_art_id = track.art_id
 
             if hq_track_art_id and hq_track_art_id != album_art_id:
                 try:
                     hq_track_art_url = f"https://f4.bcbits.com/img/a{hq_track_art_id}_0.jpg"
-                    if hq_track_art_url not in downloaded_covers:
-                        track_title = track.get('title', 'Untitled Track')
-                        track_id = track.get('track_id')
-                        track_info_for_name = {'num': track.get('track_num', 'NA'), 'artist': track.get('artist', 'Unknown_Artist')}
+                    if downloaded_covers.claim(hq_track_art_url):
+                        track_title = track.title
+                        track_id = track.track_id
+                        track_info_for_name = {'num': track.track_num, 'artist': track.artist}
                         track_filename_base = create_and_truncate_filename(None, track_title, track_id, is_track=True, track_info=track_info_for_name)
                         
-                        download_image(hq_track_art_url, target_folder, track_filename_base, bandcamp_parser)
-                        downloaded_covers.add(hq_track_art_url)
+                        new_cover_files.append(download_image(hq_track_art_url, target_folder, track_filename_base, bandcamp_parser))
                 except Exception as e:
-                    logging.error(f"Failed to process unique track art for '{track.get('title')}': {e}")
+                    logging.error(f"Failed to process unique track art for '{track.title}': {e}")
 
     if has_unique_track_covers and hash_covers:
         print(f"  -> Hashing and de-duplicating covers in: {target_folder}")
         hashes = {}
         files_to_delete = []
         
-        image_files = sorted([os.path.join(target_folder, f) for f in os.listdir(target_folder) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif'))])
+        # The album cover is hashed first, so track art identical to it is what gets deleted.
+        album_filename_base = create_and_truncate_filename(artist, title, item_id)
+        image_files = sorted([os.path.join(target_folder, f) for f in os.listdir(target_folder) if f.lower().endswith(COVER_EXTENSIONS)],
+                             key=lambda f: (os.path.splitext(os.path.basename(f))[0] != album_filename_base, f))
 
         for filepath in image_files:
             file_hash = calculate_md5(filepath)
@@ -736,7 +1825,6 @@ def process_album_covers(album_data, base_cover_folder, bandcamp_parser: Bandcam
             try:
                 remaining_filepath = list(hashes.values())[0]
                 
-                album_filename_base = create_and_truncate_filename(artist, title, item_id)
                 extension = os.path.splitext(remaining_filepath)[1]
                 destination_path = os.path.join(base_cover_folder, album_filename_base + extension)
 
@@ -750,78 +1838,282 @@ def process_album_covers(album_data, base_cover_folder, bandcamp_parser: Bandcam
                 os.rmdir(target_folder)
                 print(f"    -> Removed empty subfolder: {os.path.basename(target_folder)}")
 
+                new_cover_files = [destination_path]
+
             except (IOError, OSError, shutil.Error) as e:
                 print(f"    -> Error during consolidation: {e}")
 
+    if cover_index:
+        dedupe_covers_perceptually(new_cover_files, cover_index)
 
-if __name__ == '__main__':
+def hash_file_contents(filepath: str) -> Optional[str]:
+    try:
+        with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.blake2b(mapped, digest_size=16).hexdigest()
+    except (OSError, ValueError):
+        return None
+
+def format_size(num_bytes: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+def is_cover_folder(folder_path: str) -> bool:
+    return os.path.basename(folder_path).endswith(" - Album Covers")
+
+def find_cover_files(root: str) -> List[tuple]:
+    # Only '<artist> - Album Covers' folders and their per-album subfolders are walked,
+    # so artist images and their manifest are left alone.
+    cover_files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        if not (is_cover_folder(dirpath) or is_cover_folder(os.path.dirname(dirpath))):
+            continue
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(COVER_EXTENSIONS):
+                continue
+            filepath = os.path.join(dirpath, filename)
+            try:
+                file_stat = os.lstat(filepath)
+            except OSError:
+                continue
+            if stat.S_ISREG(file_stat.st_mode):
+                cover_files.append((filepath, file_stat))
+    return cover_files
+
+def dedupe_cover_archive(root: str, action: str = 'link') -> dict:
+    from concurrent.futures import ProcessPoolExecutor
+
+    root = os.path.abspath(root)
+    print(f"--- Scanning cover folders under {root} ---")
+    cover_files = find_cover_files(root)
+
+    # Only files sharing their size (on the same filesystem) with a different file can be
+    # duplicates, so everything else is never read. Paths that are already hardlinks of
+    # one another are hashed once.
+    size_groups = {}
+    for filepath, file_stat in cover_files:
+        if file_stat.st_size:
+            size_groups.setdefault((file_stat.st_dev, file_stat.st_size), []).append((filepath, file_stat))
+    candidates = [entries for entries in size_groups.values() if len({file_stat.st_ino for _, file_stat in entries}) > 1]
+    inode_paths = {}
+    for entries in candidates:
+        for filepath, file_stat in entries:
+            inode_paths.setdefault((file_stat.st_dev, file_stat.st_ino), filepath)
+    print(f"  -> {len(cover_files)} cover files, {len(inode_paths)} share their size with another file and will be hashed")
+
+    inode_hashes = {}
+    if inode_paths:
+        with ProcessPoolExecutor() as executor:
+            digests = executor.map(hash_file_contents, inode_paths.values(), chunksize=64)
+            for inode, filepath, digest in zip(inode_paths, inode_paths.values(), digests):
+                if digest is None:
+                    print(f"    -> Could not read file {filepath} to calculate hash.")
+                else:
+                    inode_hashes[inode] = digest
+
+    content_groups = {}
+    for entries in candidates:
+        for filepath, file_stat in entries:
+            digest = inode_hashes.get((file_stat.st_dev, file_stat.st_ino))
+            if digest:
+                content_groups.setdefault((file_stat.st_dev, file_stat.st_size, digest), []).append((filepath, file_stat))
+
+    summary = {"files": len(cover_files), "hashed": len(inode_paths), "duplicate_groups": 0, "duplicates": 0,
+               "linked": 0, "removed": 0, "consolidated": 0, "reclaimed_bytes": 0}
+    removed_paths = set()
+
+    for entries in content_groups.values():
+        if len({file_stat.st_ino for _, file_stat in entries}) < 2:
+            continue
+        summary["duplicate_groups"] += 1
+        # The shallowest copy is kept, so a cover in the artist's cover folder wins over
+        # copies inside per-album subfolders, and an album cover wins over its track art.
+        entries.sort(key=lambda entry: (entry[0].count(os.sep), not is_album_cover_file(entry[0]), entry[0]))
+        keeper_path, keeper_stat = entries[0]
+        handled_links = {}
+        kept_folders = {os.path.dirname(keeper_path)}
+        for filepath, file_stat in entries[1:]:
+            if file_stat.st_ino == keeper_stat.st_ino:
+                continue
+            summary["duplicates"] += 1
+            # As in process_album_covers, only the first copy in a folder is kept; further
+            # copies in the same folder are deleted outright. Album covers are always linked,
+            # so every release keeps a cover under its own name.
+            remove = not is_album_cover_file(filepath) and (action == 'remove' or os.path.dirname(filepath) in kept_folders)
+            kept_folders.add(os.path.dirname(filepath))
+            try:
+                if action == 'report':
+                    pass
+                elif remove:
+                    os.remove(filepath)
+                    print(f"    -> Deleted duplicate cover: {os.path.relpath(filepath, root)}")
+                else:
+                    temp_path = filepath + ".link"
+                    os.link(keeper_path, temp_path)
+                    os.replace(temp_path, filepath)
+                    print(f"    -> Linked duplicate cover {os.path.relpath(filepath, root)} to {os.path.relpath(keeper_path, root)}")
+            except OSError as e:
+                print(f"    -> Error handling duplicate cover {filepath}: {e}")
+                continue
+            if remove:
+                removed_paths.add(filepath)
+                summary["removed"] += 1
+            else:
+                summary["linked"] += 1
+            handled_links[file_stat.st_ino] = handled_links.get(file_stat.st_ino, 0) + 1
+            # Space is only freed once every link to the duplicate's inode is gone.
+            if handled_links[file_stat.st_ino] == file_stat.st_nlink:
+                summary["reclaimed_bytes"] += file_stat.st_size
+
+    album_folders = sorted({os.path.dirname(filepath) for filepath, _ in cover_files if is_cover_folder(os.path.dirname(os.path.dirname(filepath)))})
+    for album_folder in album_folders:
+        # As in process_album_covers, a subfolder is only consolidated when every cover it
+        # held was identical; copies elsewhere in the archive don't count.
+        folder_files = [(filepath, file_stat) for filepath, file_stat in cover_files if os.path.dirname(filepath) == album_folder]
+        inodes = {(file_stat.st_dev, file_stat.st_ino) for _, file_stat in folder_files}
+        if len({inode_hashes.get(inode, inode) for inode in inodes}) != 1:
+            continue
+        remaining_files = [filepath for filepath, _ in folder_files if filepath not in removed_paths]
+        if not remaining_files:
+            continue
+        remaining_files.sort(key=lambda filepath: (not is_album_cover_file(filepath), filepath))
+        remaining_filepath = remaining_files[0]
+        destination_path = os.path.join(os.path.dirname(album_folder), os.path.basename(album_folder) + os.path.splitext(remaining_filepath)[1])
+        if os.path.exists(destination_path) and hash_file_contents(destination_path) != hash_file_contents(remaining_filepath):
+            print(f"    -> Not consolidating {os.path.relpath(album_folder, root)}: a different {os.path.basename(destination_path)} already exists.")
+            continue
+        summary["consolidated"] += 1
+        if action == 'report':
+            continue
+        try:
+            if os.path.exists(destination_path):
+                os.remove(remaining_filepath)
+            else:
+                shutil.move(remaining_filepath, destination_path)
+            for filepath in remaining_files[1:]:
+                os.remove(filepath)
+            print(f"    -> Consolidated cover to: {os.path.relpath(destination_path, root)}")
+            os.rmdir(album_folder)
+            print(f"    -> Removed empty subfolder: {os.path.basename(album_folder)}")
+        except (IOError, OSError, shutil.Error) as e:
+            print(f"    -> Error during consolidation: {e}")
+
+    verb = "Reclaimable" if action == 'report' else "Reclaimed"
+    print("\n--- Cover dedupe summary ---")
+    print(f"  Files scanned: {summary['files']}, hashed: {summary['hashed']}")
+    print(f"  Duplicates: {summary['duplicates']} in {summary['duplicate_groups']} groups")
+    if action == 'report':
+        print(f"  Subfolders that would be consolidated: {summary['consolidated']}")
+    else:
+        print(f"  Linked: {summary['linked']}, deleted: {summary['removed']}, subfolders consolidated: {summary['consolidated']}")
+    print(f"  {verb} space: {format_size(summary['reclaimed_bytes'])}")
+    return summary
+
+
+DAEMON_PORT = 8765
+
+def daemon_token_path(port: int) -> str:
+    return os.path.join(os.path.expanduser("~"), f".bandcamp-archiver-{port}.token")
+
+class ArchiveJobError(Exception):
+    pass
+
+def build_arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Fetch and parse data from a Bandcamp URL.")
-    parser.add_argument("urls", nargs='+', help="One or more Bandcamp URLs to process.")
+    parser.add_argument("urls", nargs='*', help="One or more Bandcamp URLs to process.")
     parser.add_argument("-t", "--track-art", action="store_true", help="Fetch individual track cover art, about, and credits (slower).")
     parser.add_argument("-cd", "--cover-download", action="store_true", help="Download album/track covers and artist images (profile, banner, background).")
     parser.add_argument("-d", "--debug", action="store_true", help="Enable verbose debug logging.")
     parser.add_argument("-H", "--hash-covers", action="store_true", help="When downloading unique track art, verify uniqueness using MD5 hashes and remove duplicates.")
+    parser.add_argument("-ph", "--perceptual-hash", action="store_true", help="Detect near-duplicate covers (re-encoded or resized art) using perceptual hashes. Requires numpy and Pillow.")
+    parser.add_argument("-pt", "--phash-threshold", type=int, default=6, help="Maximum Hamming distance between two perceptual hashes for covers to count as near-duplicates (default: 6).")
+    parser.add_argument("-ps", "--phash-scope", choices=["artist", "archive"], default="artist", help="Compare new covers against everything seen for this artist, or for the whole archive in the current directory (default: artist).")
+    parser.add_argument("-pa", "--phash-action", choices=["link", "drop"], default="link", help="Replace track art that nearly duplicates an album cover with a hardlink to the cover, or drop it entirely. Album covers are never replaced (default: link).")
     parser.add_argument("-sl", "--save-list", action="store_true", help="Save a list of all found URLs to a file named 'bandcamp-dump.lst'.")
     parser.add_argument("-dl", "--delay", type=str, help="Add a delay between requests in milliseconds. Use a single number (e.g., '2000') for a fixed delay, or a range (e.g., '1000-5000') for a random delay between min and max milliseconds.")
     parser.add_argument("-r", "--retries", type=int, default=5, help="Set the maximum number of retries for a failed request (default: 5).")
     parser.add_argument("-rd", "--retry-delay", type=int, default=5, help="Set the initial delay in seconds before retrying a failed request. This will be multiplied by the attempt number (default: 5).")
-    args = parser.parse_args()
-
-    log_level = logging.DEBUG if args.debug else logging.INFO
-    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
-
-    if not args.urls:
-        parser.print_help()
-        sys.exit(0)
-
+    parser.add_argument("-A", "--adaptive", action="store_true", help="Adjust request pacing and concurrency per host automatically, backing off on HTTP 429, 5xx and latency spikes. Replaces --delay.")
+    parser.add_argument("-mc", "--max-concurrency", type=int, default=4, help="Upper bound for in-flight requests per host when using --adaptive (default: 4).")
+    parser.add_argument("-of", "--output-format", choices=["json", "archive", "both"], default="json", help="Save releases as the pretty-printed JSON file, as a compressed archive with one gzip frame per release plus a byte-offset index, or both (default: json).")
+    parser.add_argument("-ej", "--export-json", metavar="ARCHIVE", help="Export an existing '.releases.jsonl.gz' archive to the regular JSON format and exit.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of releases processed in parallel. Releases expected to need the most requests are started first (default: 1).")
+    parser.add_argument("-pc", "--pool-connections", type=int, default=20, help="Number of hosts (artist subdomains, custom domains, CDN) to keep connection pools open for (default: 20).")
+    parser.add_argument("-pm", "--pool-maxsize", type=int, default=10, help="Maximum number of kept-alive connections per host. Should be at least --workers (default: 10).")
+    parser.add_argument("-ka", "--keepalive", type=int, default=60, help="Seconds a pooled connection may stay idle before TCP keep-alive probes are sent (default: 60).")
+    parser.add_argument("-dt", "--dns-ttl", type=float, default=300, help="Seconds to cache resolved host addresses (default: 300).")
+    parser.add_argument("-L", "--label", action="store_true", help="Treat artist-page URLs as labels: expand each label's artist roster and discover every rostered artist's releases in parallel.")
+    parser.add_argument("-dc", "--dedupe-covers", metavar="ROOT", help="Find duplicate covers in the existing '<artist> - Album Covers' folders under ROOT, replace them according to --dedupe-action, report the space reclaimed and exit.")
+    parser.add_argument("-da", "--dedupe-action", choices=["link", "remove", "report"], default="link", help="With --dedupe-covers, replace duplicates with hardlinks, delete them, or only report what would be done. Album covers are always hardlinked (default: link).")
+    parser.add_argument("-S", "--serve", action="store_true", help="Run as a daemon that keeps one session, connection pool, DNS cache and rate limiter alive and accepts archive jobs over a local HTTP API.")
+    parser.add_argument("-C", "--connect", action="store_true", help="Submit this run as a job to the daemon running on --port and follow its progress instead of archiving in this process.")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT, help=f"Local port the daemon listens on and --connect submits to (default: {DAEMON_PORT}).")
+    return parser
+
+def create_bandcamp_parser(args) -> Bandcamp:
+    rate_controller = AdaptiveRateController(max_concurrency=args.max_concurrency) if args.adaptive else None
+    DNS_CACHE.ttl = args.dns_ttl
+    return Bandcamp(delay_arg=args.delay, retries=args.retries, retry_delay=args.retry_delay, rate_controller=rate_controller,
+                    pool_hosts=args.pool_connections, pool_size=max(args.pool_maxsize, args.workers), keepalive_idle=args.keepalive)
+
+def run_archive_job(args, bandcamp_parser: Bandcamp, output_root: Optional[str] = None) -> Optional[dict]:
+    output_root = output_root or os.getcwd()
     fetch_track_art = args.track_art
     cover_download = args.cover_download
     hash_covers = args.hash_covers
-    bandcamp_parser = Bandcamp(delay_arg=args.delay, retries=args.retries, retry_delay=args.retry_delay)
-
-    all_album_urls = set()
-    for url_to_fetch in args.urls:
-        if is_artist_page(url_to_fetch):
-            print(f"Discovering releases on artist page: {url_to_fetch}")
-            album_urls_from_page = bandcamp_parser.get_album_urls_from_artist_page(url_to_fetch)
-            all_album_urls.update(album_urls_from_page)
-        else:
-            all_album_urls.add(url_to_fetch)
+    input_urls = list(dict.fromkeys(canonicalize_url(url) for url in args.urls))
+    release_registry = ReleaseRegistry(bandcamp_parser.release_hints)
+    bandcamp_parser.artist_images = ArtistImageStore(input_urls) if cover_download else None
 
-    unique_album_urls = sorted(list(all_album_urls))
+    release_discovery = ReleaseDiscovery(bandcamp_parser, workers=args.workers, expand_labels=args.label)
+    release_discovery.start(input_urls)
+    discovered_urls = release_discovery.take()
 
-    if not unique_album_urls:
+    if not discovered_urls:
         print("No album/track URLs could be found from the provided inputs.")
-        sys.exit(0)
+        return None
 
     primary_artist_name = 'Unknown_Artist' 
-    first_cli_url = args.urls[0]
+    first_cli_url = input_urls[0]
+    first_cli_host = urlparse(first_cli_url).netloc
+    prefetched_releases = {}
     print(f"\n--- Determining primary artist from the first provided URL: {first_cli_url} ---")
+    # The band name is read from pages that are fetched anyway: the artist page fetched
+    # by discovery, or the release page, which is parsed here with the options of the
+    # run and reused when the release is processed.
     try:
-        response = bandcamp_parser._session_get(first_cli_url, headers=bandcamp_parser.headers)
-        try:
-            soup = bs4.BeautifulSoup(response.text, "lxml")
-        except bs4.FeatureNotFound:
-            soup = bs4.BeautifulSoup(response.text, "html.parser")
-        
-        band_name_element = soup.select_one('p#band-name-location span.title')
-        
-        if band_name_element and band_name_element.text:
-            primary_artist_name = band_name_element.text.strip()
+        if is_artist_page(first_cli_url):
+            while first_cli_host not in bandcamp_parser.band_names and not release_discovery.finished:
+                discovered_urls += release_discovery.take()
+        else:
+            first_album_data = bandcamp_parser.parse(first_cli_url, fetch_track_art=fetch_track_art)
+            if first_album_data:
+                prefetched_releases[first_cli_url] = first_album_data
+
+        if first_cli_host in bandcamp_parser.band_names:
+            primary_artist_name = bandcamp_parser.band_names[first_cli_host]
             print(f"Determined primary artist from HTML: {primary_artist_name}")
         else:
             print("Could not find artist name in '#band-name-location' block. Falling back to parsing the page content.")
-            fallback_url = unique_album_urls[0] if unique_album_urls else first_cli_url
-            first_album_data = bandcamp_parser.parse(fallback_url, fetch_track_art=False)
-            if first_album_data and first_album_data.get('artist'):
-                primary_artist_name = first_album_data.get('artist')
+            # Discovery order depends on thread timing, so an artist page falls back to the
+            # first of all its releases in URL order.
+            fallback_url = first_cli_url
+            if is_artist_page(first_cli_url):
+                while not release_discovery.finished:
+                    discovered_urls += release_discovery.take()
+                fallback_url = min(discovered_urls)
+                first_album_data = bandcamp_parser.parse(fallback_url, fetch_track_art=fetch_track_art)
+                if first_album_data:
+                    prefetched_releases[fallback_url] = first_album_data
+            first_album_data = prefetched_releases.get(fallback_url)
+            if first_album_data and first_album_data.artist:
+                primary_artist_name = first_album_data.artist
                 print(f"Determined primary artist via page parse fallback: {primary_artist_name}")
             else:
                  print("Fallback method also failed. Using 'Unknown_Artist'.")
 
-    except requests.exceptions.RequestException as e:
-        print(f"Fatal: Could not fetch the first URL to determine the primary artist: {e}. Exiting.")
-        sys.exit(1)
     except Exception as e:
         print(f"An unexpected error occurred while determining the primary artist: {e}")
         print("Using 'Unknown_Artist' as a fallback.")
@@ -832,24 +2124,16 @@ if __name__ == '__main__':
     print(f"Using primary artist: {primary_artist_name}")
 
     artist_folder_name = create_safe_filename(primary_artist_name)
-    artist_folder_path = os.path.join(os.getcwd(), artist_folder_name)
+    artist_folder_path = os.path.join(output_root, artist_folder_name)
     os.makedirs(artist_folder_path, exist_ok=True)
     print(f"Output directory: {artist_folder_path}")
 
-
-    if cover_download:
-        print("\n--- Checking for artist-level images from provided URLs ---")
-        for i, page_url in enumerate(args.urls):
-            print(f"  -> Checking page {i+1}/{len(args.urls)}: {page_url}")
-            try:
-                response = bandcamp_parser._session_get(page_url, headers=bandcamp_parser.headers)
-                soup = bs4.BeautifulSoup(response.text, "lxml")
-                download_artist_images(page_url, soup, artist_folder_path, bandcamp_parser, i + 1)
-            except Exception as e:
-                print(f"    -> Could not process artist images for {page_url}. Error: {e}")
-
     all_releases_data = []
-    downloaded_covers = set()
+    release_archive = None
+    if args.output_format in ("archive", "both"):
+        release_archive = ReleaseArchive(os.path.join(artist_folder_path, create_safe_filename(primary_artist_name)))
+        print(f"Appending releases to archive: {release_archive.data_path}")
+    downloaded_covers = DownloadedCovers()
     removed_log_entries = []
     urls_to_remove = set()
     cover_folder = ""
@@ -858,40 +2142,148 @@ if __name__ == '__main__':
         cover_folder = os.path.join(artist_folder_path, folder_name_base)
         os.makedirs(cover_folder, exist_ok=True)
 
-    for i, album_url in enumerate(unique_album_urls):
-        print(f"\n--- Processing release {i+1}/{len(unique_album_urls)}: {album_url} ---")
-        
-        album_data = bandcamp_parser.parse(album_url, fetch_track_art=fetch_track_art)
-        
-        if album_data:
-            if args.save_list:
-                is_preorder = album_data.get("is_preorder") is True
-                has_empty_trackinfo = isinstance(album_data.get("trackinfo"), list) and not album_data.get("trackinfo")
-                reason_for_removal = None
-
-                if is_preorder:
-                    reason_for_removal = "Item is a pre-order."
-                elif has_empty_trackinfo:
-                    reason_for_removal = "Empty trackinfo, assuming album has no streamable tracks."
-
-                if reason_for_removal:
-                    print(f"  -> Item will be excluded from URL list. Reason: {reason_for_removal}")
-                    urls_to_remove.add(album_url)
-                    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    log_entry = (
-                        f"[{timestamp}] URL: {album_url}\n"
-                        f"        Reason: {reason_for_removal}"
-                    )
-                    removed_log_entries.append(log_entry)
+    cover_index = None
+    if cover_download and args.perceptual_hash:
+        if perceptual_hash_available():
+            index_dir = artist_folder_path if args.phash_scope == "artist" else output_root
+            cover_index = CoverHashIndex(os.path.join(index_dir, ".cover-phash-index.json"), args.phash_threshold, args.phash_action)
+        else:
+            print("--- Error: Perceptual hashing requires the 'numpy' and 'Pillow' libraries. Continuing without it. ---")
+
+    release_registry.load_aliases(artist_folder_path)
+    release_costs = load_release_costs(artist_folder_path)
+    unique_album_urls = []
+    stored_urls = []
+
+    def parse_release(album_url: str) -> Union[Release, None]:
+        print(f"\n--- Processing release: {album_url} ---")
+        owner_url = release_registry.claim(album_url, bandcamp_parser.release_hints.get(album_url, {}).get('item_key'))
+        if owner_url:
+            print(f"  -> Same release as {owner_url}, skipping.")
+            return None
+
+        album_data = prefetched_releases.pop(album_url, None) or bandcamp_parser.parse(album_url, fetch_track_art=fetch_track_art)
+        if not album_data:
+            release_registry.unclaim(album_url, bandcamp_parser.release_hints.get(album_url, {}).get('item_key'))
+        else:
+            owner_url = release_registry.claim(album_url, release_key(album_url, album_data.item_id))
+            if owner_url:
+                print(f"  -> Same release (item_id {album_data.item_id}) as {owner_url}, keeping only the first.")
+                return None
+        return album_data
+
+    # Covers are fetched by the same worker that parsed the release, so a release with many
+    # track covers doesn't hold up dispatching the remaining releases.
+    def process_release(album_url: str) -> Union[Release, None]:
+        album_data = parse_release(album_url)
+        if album_data and cover_download:
+            print(f"  -> Checking for album/track covers: {album_url}")
+            try:
+                process_album_covers(album_data, cover_folder, bandcamp_parser, fetch_track_art, downloaded_covers, hash_covers, cover_index)
+            except Exception as e:
+                print(f"  -> Failed to process covers of {album_url}. Error: {e}")
+        return album_data
+
+    def store_release(album_url: str, album_data: Union[Release, None]):
+        if not album_data:
+            return
 
+        if args.save_list:
+            is_preorder = album_data.is_preorder is True
+            has_empty_trackinfo = not album_data.trackinfo
+            reason_for_removal = None
+
+            if is_preorder:
+                reason_for_removal = "Item is a pre-order."
+            elif has_empty_trackinfo:
+                reason_for_removal = "Empty trackinfo, assuming album has no streamable tracks."
+
+            if reason_for_removal:
+                print(f"  -> Item will be excluded from URL list. Reason: {reason_for_removal}")
+                urls_to_remove.add(album_url)
+                timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                log_entry = (
+                    f"[{timestamp}] URL: {album_url}\n"
+                    f"        Reason: {reason_for_removal}"
+                )
+                removed_log_entries.append(log_entry)
+
+        stored_urls.append(album_url)
+        if release_archive and not release_archive.append(album_data, primary_artist_name):
+            print("  -> Release unchanged since it was last archived, not appending it again.")
+        if args.output_format != "archive":
             all_releases_data.append(album_data)
-            
-            if cover_download:
-                print(f"  -> Checking for album/track covers...")
-                process_album_covers(album_data, cover_folder, bandcamp_parser, fetch_track_art, downloaded_covers, hash_covers)
+
+    # Discovered releases wait in a heap and the most expensive one is dispatched whenever
+    # a worker is free (longest-processing-time-first), so a single large compilation
+    # doesn't end up as the tail of the run. Releases are stored in alphabetical order
+    # once discovery has finished and every release before them is done.
+    def store_finished_releases(next_to_store: int) -> int:
+        if next_to_store == 0:
+            unique_album_urls.sort()
+        while next_to_store < len(unique_album_urls) and unique_album_urls[next_to_store] in finished_releases:
+            store_album_url = unique_album_urls[next_to_store]
+            store_release(store_album_url, finished_releases.pop(store_album_url))
+            next_to_store += 1
+        return next_to_store
+
+    pending_releases = []
+    in_flight = {}
+    finished_releases = {}
+    next_to_store = 0
+    workers = max(1, args.workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            for discovered_url in discovered_urls:
+                album_url = release_registry.admit(discovered_url)
+                if album_url:
+                    unique_album_urls.append(album_url)
+                    cost = estimate_release_cost(album_url, fetch_track_art, bandcamp_parser.release_hints, release_costs)
+                    heapq.heappush(pending_releases, (-cost, album_url))
+
+            while pending_releases and len(in_flight) < workers:
+                _, album_url = heapq.heappop(pending_releases)
+                in_flight[executor.submit(process_release, album_url)] = album_url
+
+            if not in_flight:
+                if release_discovery.finished:
+                    break
+                discovered_urls = release_discovery.take()
+                continue
+
+            done, _ = wait(in_flight, timeout=None if release_discovery.finished else 0.1, return_when=FIRST_COMPLETED)
+            discovered_urls = release_discovery.take(timeout=0)
+
+            for future in done:
+                album_url = in_flight.pop(future)
+                try:
+                    album_data = future.result()
+                except Exception as e:
+                    print(f"  -> Failed to process release {album_url}. Error: {e}")
+                    album_data = None
+                finished_releases[album_url] = album_data
+
+                if album_data:
+                    release_costs[album_url] = len(album_data.trackinfo)
+
+            if release_discovery.finished and not discovered_urls:
+                next_to_store = store_finished_releases(next_to_store)
+
+    next_to_store = store_finished_releases(next_to_store)
+
+    save_release_costs(release_costs, artist_folder_path)
+    release_registry.save_aliases(artist_folder_path)
+
+    if cover_index:
+        cover_index.save()
+
+    if cover_download:
+        print("\n--- Downloading artist-level images from provided URLs ---")
+        bandcamp_parser.artist_images.collect_missing_pages(bandcamp_parser)
+        bandcamp_parser.artist_images.download_all(artist_folder_path, bandcamp_parser)
 
     if args.save_list:
-        final_dump_urls = [url for url in unique_album_urls if url not in urls_to_remove]
+        final_dump_urls = [url for url in unique_album_urls if url not in urls_to_remove and url not in release_registry.aliases]
         list_filename = os.path.join(artist_folder_path, "bandcamp-dump.lst")
         save_url_list(final_dump_urls, list_filename)
 
@@ -899,10 +2291,351 @@ if __name__ == '__main__':
             removed_filename = os.path.join(artist_folder_path, "removed.txt")
             save_removed_log(removed_log_entries, removed_filename)
 
+    json_filename = None
     if all_releases_data:
         final_json_data = {primary_artist_name: all_releases_data}
         json_filename_base = f"{create_safe_filename(primary_artist_name)}.json"
         json_filename = os.path.join(artist_folder_path, json_filename_base)
         save_data_to_json(final_json_data, json_filename)
-    else:
-        print("Finished processing, but no data was successfully extracted.")
\ No newline at end of file
+    elif not release_archive:
+        print("Finished processing, but no data was successfully extracted.")
+
+    return {
+        "artist": primary_artist_name,
+        "output_dir": artist_folder_path,
+        "releases": len(stored_urls),
+        "json": json_filename,
+        "archive": release_archive.data_path if release_archive else None
+    }
+
+class ArchiveJob:
+    def __init__(self, job_id: int, argv: List[str], cwd: str):
+        self.id = job_id
+        self.argv = argv
+        self.cwd = cwd
+        self.status = "queued"
+        self.output = []
+        self.partial_line = ""
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    def append_output(self, text: str):
+        with self.lock:
+            lines = (self.partial_line + text).split("\n")
+            self.partial_line = lines.pop()
+            self.output.extend(lines)
+
+    def to_dict(self, since: int = 0) -> dict:
+        with self.lock:
+            output = self.output[since:]
+            if self.finished_at and self.partial_line:
+                output.append(self.partial_line)
+            return {
+                "id": self.id,
+                "status": self.status,
+                "args": self.argv,
+                "cwd": self.cwd,
+                "submitted_at": self.submitted_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "output": output,
+                "next": since + len(output),
+                "result": self.result,
+                "error": self.error
+            }
+
+class JobOutput:
+    # Replaces sys.stdout/sys.stderr while serving. Everything is still written to the
+    # daemon's own stream and is also added to the log of the running job, including
+    # output from its discovery and release worker threads.
+    def __init__(self, stream):
+        self.stream = stream
+        self.job = None
+
+    def write(self, text: str) -> int:
+        self.stream.write(text)
+        job = self.job
+        if job is not None:
+            job.append_output(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class ArchiveDaemon:
+    # Runs archive jobs one at a time on a single long-lived Bandcamp parser, so the
+    # session, kept-alive connections, TLS sessions, DNS cache and rate controller state
+    # carry over from one job to the next. Options that configure the parser itself
+    # (--delay, --retries, --adaptive, pool and DNS settings) are taken from the daemon's
+    # command line; all other options apply per job.
+    DAEMON_OPTIONS = ("serve", "connect", "export_json", "dedupe_covers")
+
+    def __init__(self, arg_parser: argparse.ArgumentParser, bandcamp_parser: Bandcamp):
+        self.arg_parser = arg_parser
+        self.bandcamp_parser = bandcamp_parser
+        self.jobs = {}
+        self.job_queue = queue.Queue()
+        self.jobs_lock = threading.Lock()
+        self.stdout = JobOutput(sys.stdout)
+        self.stderr = JobOutput(sys.stderr)
+
+    def submit(self, argv: List[str], cwd: str) -> ArchiveJob:
+        with self.jobs_lock:
+            job = ArchiveJob(len(self.jobs) + 1, argv, cwd)
+            self.jobs[job.id] = job
+        self.job_queue.put(job)
+        return job
+
+    def run_jobs(self):
+        while True:
+            job = self.job_queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            self.stdout.job = self.stderr.job = job
+            try:
+                print(f"\n=== Job {job.id}: {' '.join(job.argv)} ===")
+                job.result = self.run_job(job)
+                job.status = "done"
+            except ArchiveJobError as e:
+                print(f"Fatal: {e}.")
+                job.error = str(e)
+                job.status = "failed"
+            except SystemExit as e:
+                job.error = f"Invalid arguments (exit code {e.code})."
+                job.status = "failed"
+            except Exception as e:
+                logging.exception(f"Job {job.id} failed")
+                job.error = f"{type(e).__name__}: {e}"
+                job.status = "failed"
+            finally:
+                self.stdout.flush()
+                self.stdout.job = self.stderr.job = None
+                job.finished_at = time.time()
+
+    def run_job(self, job: ArchiveJob) -> Optional[dict]:
+        job_args = self.arg_parser.parse_args(job.argv)
+        for option in self.DAEMON_OPTIONS:
+            if getattr(job_args, option):
+                raise ArchiveJobError(f"--{option.replace('_', '-')} cannot be used in a job")
+        if not job_args.urls:
+            raise ArchiveJobError("No URLs given")
+        result = run_archive_job(job_args, self.bandcamp_parser, output_root=job.cwd)
+        print_request_metrics(self.bandcamp_parser)
+        return result
+
+    def status(self) -> dict:
+        with self.jobs_lock:
+            jobs = list(self.jobs.values())
+        adapter = self.bandcamp_parser.adapter
+        with adapter.counts_lock:
+            request_counts = dict(adapter.request_counts)
+        rate_controller = self.bandcamp_parser.rate_controller
+        return {
+            "jobs": {status: sum(1 for job in jobs if job.status == status) for status in ("queued", "running", "done", "failed")},
+            "requests": request_counts,
+            "dns": {"lookups": DNS_CACHE.lookups, "hits": DNS_CACHE.hits},
+            "rate_controller": rate_controller.snapshot() if rate_controller else None
+        }
+
+    def serve(self, port: int):
+        from http.server import ThreadingHTTPServer
+
+        # Every request must carry this token. It is only readable by the current user,
+        # so web pages open in a browser can't submit jobs to the daemon.
+        token = secrets.token_urlsafe(32)
+        token_path = daemon_token_path(port)
+        server = ThreadingHTTPServer(("127.0.0.1", port), make_request_handler(self, token, port))
+        token_fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.chmod(token_path, 0o600)
+        with os.fdopen(token_fd, 'w', encoding='utf-8') as f:
+            f.write(token)
+
+        sys.stdout, sys.stderr = self.stdout, self.stderr
+        threading.Thread(target=self.run_jobs, name="archive-jobs", daemon=True).start()
+        print(f"--- Serving archive jobs on http://127.0.0.1:{port} (Ctrl+C to stop) ---")
+        print(f"--- Access token written to {token_path} ---")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n--- Stopping daemon ---")
+        finally:
+            server.server_close()
+            try:
+                os.remove(token_path)
+            except OSError:
+                pass
+
+def make_request_handler(daemon: ArchiveDaemon, token: str, port: int):
+    from http.server import BaseHTTPRequestHandler
+    from urllib.parse import parse_qs
+
+    allowed_origins = {f"http://127.0.0.1:{port}", f"http://localhost:{port}"}
+
+    class ArchiveRequestHandler(BaseHTTPRequestHandler):
+        # GET /status, GET /jobs, GET /jobs/<id>?since=<line>, POST /jobs {"args": [...], "cwd": "..."}
+        # All requests need "Authorization: Bearer <token>"; see ArchiveDaemon.serve.
+        def send_json(self, status_code: int, data):
+            body = json.dumps(data).encode("utf-8")
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def authorize(self) -> bool:
+            origin = self.headers.get("Origin")
+            if origin is not None and origin not in allowed_origins:
+                self.send_json(403, {"error": f"Requests from {origin} are not allowed."})
+                return False
+            scheme, _, request_token = self.headers.get("Authorization", "").partition(" ")
+            if scheme != "Bearer" or not hmac.compare_digest(request_token.encode("utf-8"), token.encode("utf-8")):
+                self.send_json(401, {"error": f"Missing or wrong access token (see {daemon_token_path(port)})."})
+                return False
+            return True
+
+        def do_GET(self):
+            if not self.authorize():
+                return
+            parsed_path = urlparse(self.path)
+            if parsed_path.path == "/status":
+                self.send_json(200, daemon.status())
+            elif parsed_path.path == "/jobs":
+                with daemon.jobs_lock:
+                    jobs = list(daemon.jobs.values())
+                self.send_json(200, [{"id": job.id, "status": job.status, "args": job.argv} for job in jobs])
+            elif parsed_path.path.startswith("/jobs/"):
+                job_id = parsed_path.path[len("/jobs/"):]
+                job = daemon.jobs.get(int(job_id)) if job_id.isdigit() else None
+                if not job:
+                    self.send_json(404, {"error": f"Unknown job: {job_id}"})
+                    return
+                since = parse_qs(parsed_path.query).get("since", ["0"])[0]
+                self.send_json(200, job.to_dict(int(since) if since.isdigit() else 0))
+            else:
+                self.send_json(404, {"error": f"Unknown path: {parsed_path.path}"})
+
+        def do_POST(self):
+            if not self.authorize():
+                return
+            if urlparse(self.path).path != "/jobs":
+                self.send_json(404, {"error": f"Unknown path: {self.path}"})
+                return
+            if self.headers.get("Content-Type", "").split(";")[0].strip().lower() != "application/json":
+                self.send_json(415, {"error": "Jobs must be submitted as application/json."})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            except (ValueError, UnicodeDecodeError) as e:
+                self.send_json(400, {"error": f"Invalid JSON: {e}"})
+                return
+            argv = request.get("args") if isinstance(request, dict) else None
+            if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+                self.send_json(400, {"error": "'args' must be a list of command-line arguments."})
+                return
+            cwd = request.get("cwd") or os.getcwd()
+            if not isinstance(cwd, str) or not os.path.isabs(cwd) or not os.path.isdir(cwd):
+                self.send_json(400, {"error": f"'cwd' must be an existing absolute directory: {cwd}"})
+                return
+            job = daemon.submit(argv, cwd)
+            self.send_json(202, job.to_dict())
+
+        def log_message(self, format, *args):
+            logging.getLogger("bandcamp-dl").getChild("Daemon").debug(format % args)
+
+    return ArchiveRequestHandler
+
+def submit_job_to_daemon(port: int, job_argv: List[str]) -> int:
+    import urllib.request
+    import urllib.error
+
+    daemon_url = f"http://127.0.0.1:{port}"
+    try:
+        with open(daemon_token_path(port), 'r', encoding='utf-8') as f:
+            auth_headers = {"Authorization": f"Bearer {f.read().strip()}"}
+    except OSError as e:
+        print(f"--- Error: Could not read the daemon's access token. Is a daemon running on port {port}? ({e}) ---")
+        return 1
+
+    request = urllib.request.Request(f"{daemon_url}/jobs", data=json.dumps({"args": job_argv, "cwd": os.getcwd()}).encode("utf-8"),
+                                     headers={"Content-Type": "application/json", **auth_headers}, method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            job = json.load(response)
+    except urllib.error.HTTPError as e:
+        print(f"--- Error: The daemon rejected the job: {e.read().decode('utf-8', 'replace')} ---")
+        return 1
+    except urllib.error.URLError as e:
+        print(f"--- Error: Could not reach the archive daemon at {daemon_url}: {e.reason} ---")
+        return 1
+
+    print(f"--- Submitted job {job['id']} to {daemon_url} ---")
+    next_line = 0
+    try:
+        while True:
+            with urllib.request.urlopen(urllib.request.Request(f"{daemon_url}/jobs/{job['id']}?since={next_line}", headers=auth_headers)) as response:
+                job = json.load(response)
+            for line in job["output"]:
+                print(line)
+            next_line = job["next"]
+            if job["status"] in ("done", "failed"):
+                break
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        print(f"\n--- Stopped following job {job['id']}; it keeps running on the daemon ---")
+        return 130
+    except urllib.error.URLError as e:
+        print(f"--- Error: Lost connection to the archive daemon: {e} ---")
+        return 1
+
+    if job["status"] == "failed":
+        print(f"--- Job {job['id']} failed: {job['error']} ---")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    parser = build_arg_parser()
+    args = parser.parse_args()
+
+    log_level = logging.DEBUG if args.debug else logging.INFO
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+    if args.export_json:
+        release_archive = ReleaseArchive(args.export_json)
+        if not release_archive.entries:
+            print(f"--- Error: No releases found in archive index {release_archive.index_path} ---")
+            sys.exit(1)
+        json_filename = release_archive.data_path[:-len(ReleaseArchive.DATA_SUFFIX)] + ".json"
+        release_archive.export_json(json_filename)
+        sys.exit(0)
+
+    if args.dedupe_covers:
+        if not os.path.isdir(args.dedupe_covers):
+            print(f"--- Error: {args.dedupe_covers} is not a directory ---")
+            sys.exit(1)
+        dedupe_cover_archive(args.dedupe_covers, args.dedupe_action)
+        sys.exit(0)
+
+    if args.serve:
+        archive_daemon = ArchiveDaemon(parser, create_bandcamp_parser(args))
+        logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s', stream=archive_daemon.stderr, force=True)
+        archive_daemon.serve(args.port)
+        sys.exit(0)
+
+    if not args.urls:
+        parser.print_help()
+        sys.exit(0)
+
+    if args.connect:
+        job_argv = [arg for arg in sys.argv[1:] if arg not in ("-C", "--connect")]
+        sys.exit(submit_job_to_daemon(args.port, job_argv))
+
+    bandcamp_parser = create_bandcamp_parser(args)
+    run_archive_job(args, bandcamp_parser)
+    print_request_metrics(bandcamp_parser)
@@ -0,0 +1,49 @@
+# Compares the memory used per track by the old nested dicts and the slotted Track
+# records of bandcamp-archiver.py, with and without the extra fields added by -t.
+# Run from the repository root: python benchmarks/record_memory.py
+import importlib.util
+import os
+import sys
+import tracemalloc
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "bandcamp-archiver.py")
+TRACK_COUNT = 100000
+
+spec = importlib.util.spec_from_file_location("bandcamp_archiver", SCRIPT_PATH)
+archiver = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = archiver
+spec.loader.exec_module(archiver)
+
+def make_track(i: int, as_dict: bool, fetch_track_art: bool):
+    # Fresh string objects per track, as they come out of each page's JSON.
+    label = "Some Label Name".upper().lower()
+    artist = "Various Artists Collective".upper().lower()
+    duration = f"{(i % 9):02d}:{(i % 60):02d}"
+    track_num = str(i % 20)
+    license = "all rights reserved".upper().lower()
+
+    if as_dict:
+        track = {"title": f"Track {i}", "duration": duration, "lyrics": None, "label": label, "track_id": 10**9 + i,
+                 "track_num": track_num, "artist": artist, "url": f"https://x.bandcamp.com/track/t{i}"}
+        if fetch_track_art:
+            track.update(trackCoverUrl_0=f"https://f4.bcbits.com/img/a{i}_0", art_id=i, about=None, credits=None, license=license)
+        return track
+
+    track = archiver.Track(f"Track {i}", archiver.intern_value(duration), None, archiver.intern_value(label), 10**9 + i,
+                           archiver.intern_value(track_num), archiver.intern_value(artist), f"https://x.bandcamp.com/track/t{i}")
+    if fetch_track_art:
+        track.page_fetched = True
+        track.track_cover_url_0 = f"https://f4.bcbits.com/img/a{i}_0"
+        track.art_id = i
+        track.license = archiver.intern_value(license)
+    return track
+
+if __name__ == '__main__':
+    for fetch_track_art in (False, True):
+        for as_dict in (True, False):
+            tracemalloc.start()
+            tracks = [make_track(i, as_dict, fetch_track_art) for i in range(TRACK_COUNT)]
+            used, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del tracks
+            print(f"{'with -t' if fetch_track_art else 'without -t':<10} {'dict' if as_dict else 'Track':<6} {round(used / TRACK_COUNT)} bytes/track")